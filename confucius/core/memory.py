@@ -160,6 +160,27 @@ class CfMessage(BaseModel):
     def __lt__(self, other: CfMessage) -> bool:
         return self._sequence_id < other._sequence_id
 
+    def copy_with_new_sequence_id(self) -> CfMessage:
+        """
+        Copy the message with a new sequence id, so that it is ordered after the
+        existing messages. Unlike a serialization round trip, the fields are not
+        validated again; only the containers that are modified in place by the
+        orchestrator (e.g. content blocks and `additional_kwargs`) are copied.
+        """
+        content = self.content
+        if isinstance(content, list):
+            content = [dict(ct) if isinstance(ct, dict) else ct for ct in content]
+        message = self.model_copy(
+            update={
+                "path": list(self.path),
+                "content": content,
+                "attachments": list(self.attachments),
+                "additional_kwargs": dict(self.additional_kwargs),
+            }
+        )
+        message._sequence_id = _global_messages_counter.get_next()
+        return message
+
     async def to_lc_messages(self) -> List[BaseMessage]:
         if self.type == cf.MessageType.AI:
             return [
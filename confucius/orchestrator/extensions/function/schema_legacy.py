@@ -0,0 +1,393 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# pyre-strict
+
+"""
+Original type-hint based JSON schema generation for function parameters.
+
+The TypeAdapter based generator in `utils` is used by default; this module is only
+imported when `CCA_LEGACY_SCHEMA` is set or `type_to_json_schema` is accessed.
+"""
+
+import copy
+import inspect
+from dataclasses import fields as dc_fields, MISSING
+from functools import lru_cache
+
+from typing import Any, Callable, Dict, get_args, get_type_hints, List, Type
+
+from pydantic import BaseModel
+
+from .utils import (
+    _classify_type,
+    _get_signature,
+    _parse_param_docs,
+    _TYPE_DATACLASS,
+    _TYPE_DICT,
+    _TYPE_LIST,
+    _TYPE_LITERAL,
+    _TYPE_PRIMITIVE,
+    _TYPE_PYDANTIC,
+    _TYPE_TYPED_DICT,
+    _TYPE_UNION,
+    Function,
+    PythonPrimitiveType,
+    UnionTypeAlias,
+)
+
+AllTypes = (
+    PythonPrimitiveType
+    | UnionTypeAlias
+    | Type[List[Any]]
+    | Type[Dict[str, Any]]
+    | Type[object]  # For custom types
+)
+
+
+class _FrozenSchema(Dict[str, Any]):
+    """
+    Read-only JSON schema fragment shared across generated schemas.
+
+    It is still a dict, so it serializes like any other schema. Copy it (e.g. with
+    `dict(...)`) before adding keys to it.
+    """
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError(
+            "Shared JSON schema fragments are read-only, copy before modifying"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Dict[str, Any]:
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_FrozenSchema, (dict(self),))
+
+
+_STRING_SCHEMA = _FrozenSchema(type="string")
+_INTEGER_SCHEMA = _FrozenSchema(type="integer")
+_NUMBER_SCHEMA = _FrozenSchema(type="number")
+_BOOLEAN_SCHEMA = _FrozenSchema(type="boolean")
+_NULL_SCHEMA = _FrozenSchema(type="null")
+_OBJECT_SCHEMA = _FrozenSchema(type="object")
+
+
+def _handle_primitive_type(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle primitive types in JSON schema conversion.
+
+    Args:
+        type_hint: Python primitive type
+
+    Returns:
+        Shared read-only JSON schema for the primitive type
+    """
+    if type_hint is str:
+        return _STRING_SCHEMA
+    elif type_hint is int:
+        return _INTEGER_SCHEMA
+    elif type_hint is float:
+        return _NUMBER_SCHEMA
+    elif type_hint is bool:
+        return _BOOLEAN_SCHEMA
+    return _NULL_SCHEMA
+
+
+def _handle_union_type(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle Union types in JSON schema conversion.
+
+    Args:
+        type_hint: Python Union type
+
+    Returns:
+        JSON schema for the Union type
+    """
+    args = get_args(type_hint)
+    none_type = type(None)
+    if none_type in args:
+        # If this is an Optional type (T | None), get the non-None type directly
+        if len(args) == 2:
+            return type_to_json_schema(args[1] if args[0] is none_type else args[0])
+        args = tuple(arg for arg in args if arg is not none_type)
+    if len(args) == 1:
+        return type_to_json_schema(args[0])
+
+    # Handle union of multiple types
+    any_of = [type_to_json_schema(t) for t in args]
+    return {"anyOf": any_of}
+
+
+def _handle_list_type(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle List types in JSON schema conversion.
+
+    Args:
+        type_hint: Python List type
+
+    Returns:
+        JSON schema for the List type
+    """
+    # If generic type is provided, use it; otherwise, default to any
+    item_type = get_args(type_hint)
+    item_schema = type_to_json_schema(item_type[0]) if item_type else _OBJECT_SCHEMA
+    return {"type": "array", "items": item_schema}
+
+
+def _handle_dict_type(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle Dict types in JSON schema conversion.
+
+    Args:
+        type_hint: Python Dict type
+
+    Returns:
+        JSON schema for the Dict type
+    """
+    # Maintain compatibility with existing tests by always returning simple object schema
+    return _OBJECT_SCHEMA
+
+
+def _handle_literal_type(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle Literal types in JSON schema conversion.
+
+    Args:
+        type_hint: Python Literal type
+
+    Returns:
+        JSON schema for the Literal type
+    """
+    literal_values = get_args(type_hint)
+    # Ensure all values are of the same type
+    if literal_values and all(
+        isinstance(val, type(literal_values[0])) for val in literal_values
+    ):
+        base_schema = type_to_json_schema(type(literal_values[0]))
+        return {**base_schema, "enum": list(literal_values)}
+    return {"enum": list(literal_values)}
+
+
+# Pydantic v2 deprecates `schema()` (and warns on every call) in favor of `model_json_schema()`
+_PYDANTIC_JSON_SCHEMA_METHOD: str = (
+    "model_json_schema" if hasattr(BaseModel, "model_json_schema") else "schema"
+)
+
+
+@lru_cache(maxsize=None)
+def _pydantic_model_schema(model_type: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Get the JSON schema of a pydantic model, computed once per model class.
+
+    Args:
+        model_type: The pydantic model class
+
+    Returns:
+        JSON schema of the model (shared, do not modify)
+    """
+    return getattr(model_type, _PYDANTIC_JSON_SCHEMA_METHOD)()
+
+
+def _handle_pydantic_model(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle pydantic BaseModel types in JSON schema conversion.
+
+    Args:
+        type_hint: Python pydantic BaseModel type
+
+    Returns:
+        JSON schema for the pydantic BaseModel
+    """
+    # Cached per model class, copied since callers may enrich the schema
+    # pyre-ignore: Incompatible parameter type [6]: classified as a pydantic model
+    return copy.deepcopy(_pydantic_model_schema(type_hint))
+
+
+@lru_cache(maxsize=None)
+def _typed_dict_schema(typed_dict_type: type) -> Dict[str, Any]:
+    """
+    Build the JSON schema of a TypedDict, computed once per TypedDict class.
+
+    Args:
+        typed_dict_type: The TypedDict class
+
+    Returns:
+        JSON schema of the TypedDict (shared, do not modify)
+    """
+    annotations = typed_dict_type.__annotations__
+    # `__required_keys__` accounts for `total=False` and Required/NotRequired
+    required_keys = getattr(typed_dict_type, "__required_keys__", None)
+    if required_keys is None:
+        required_keys = (
+            frozenset(annotations)
+            if getattr(typed_dict_type, "__total__", True)
+            else frozenset()
+        )
+
+    properties = {
+        field_name: type_to_json_schema(field_type)
+        for field_name, field_type in annotations.items()
+    }
+    required = [field_name for field_name in annotations if field_name in required_keys]
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def _handle_typed_dict(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle TypedDict types in JSON schema conversion.
+
+    Args:
+        type_hint: Python TypedDict type
+
+    Returns:
+        JSON schema for the TypedDict type
+    """
+    # Cached per TypedDict class, copied since callers may enrich the schema
+    # pyre-ignore: Incompatible parameter type [6]: classified as a TypedDict
+    return copy.deepcopy(_typed_dict_schema(type_hint))
+
+
+@lru_cache(maxsize=None)
+def _dataclass_schema(dataclass_type: type) -> Dict[str, Any]:
+    """
+    Build the JSON schema of a dataclass, computed once per dataclass.
+
+    Args:
+        dataclass_type: The dataclass
+
+    Returns:
+        JSON schema of the dataclass (shared, do not modify)
+    """
+    # Resolve string annotations (e.g. `from __future__ import annotations`)
+    try:
+        type_hints = get_type_hints(dataclass_type)
+    except Exception:
+        type_hints = {}
+
+    properties = {}
+    required = []
+
+    for field in dc_fields(dataclass_type):
+        properties[field.name] = type_to_json_schema(
+            type_hints.get(field.name, field.type)
+        )
+
+        # For dataclasses, fields without a default or default factory are required
+        if field.default is MISSING and field.default_factory is MISSING:
+            required.append(field.name)
+
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def _handle_dataclass(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Handle dataclass types in JSON schema conversion.
+
+    Args:
+        type_hint: Python dataclass type
+
+    Returns:
+        JSON schema for the dataclass type
+    """
+    # Cached per dataclass, copied since callers may enrich the schema
+    # pyre-ignore: Incompatible parameter type [6]: classified as a dataclass
+    return copy.deepcopy(_dataclass_schema(type_hint))
+
+
+_TYPE_HANDLERS: dict[int, Callable[[AllTypes], Dict[str, Any]]] = {
+    _TYPE_PRIMITIVE: _handle_primitive_type,
+    _TYPE_UNION: _handle_union_type,
+    _TYPE_LIST: _handle_list_type,
+    _TYPE_DICT: _handle_dict_type,
+    _TYPE_LITERAL: _handle_literal_type,
+    _TYPE_PYDANTIC: _handle_pydantic_model,
+    _TYPE_TYPED_DICT: _handle_typed_dict,
+    _TYPE_DATACLASS: _handle_dataclass,
+}
+
+
+def type_to_json_schema(type_hint: AllTypes) -> Dict[str, Any]:
+    """
+    Convert Python type hints to JSON Schema representation.
+
+    Supports primitive types, Union types (both Union[T, None] and T | None syntax),
+    Lists, Dictionaries, pydantic BaseModel, TypedDict, dataclasses, and gracefully
+    handles other complex types.
+
+    Args:
+        type_hint: Python type annotation to convert to JSON schema
+
+    Returns:
+        Dictionary representing JSON Schema for the type. Primitive fragments are
+        shared and read-only, copy them before modifying.
+
+    Examples:
+        >>> type_to_json_schema(str)
+        {'type': 'string'}
+        >>> type_to_json_schema(Optional[int])  # or int | None in Python 3.10+
+        {'type': 'integer'}
+        >>> type_to_json_schema(List[str])
+        {'type': 'array', 'items': {'type': 'string'}}
+        >>> # For a pydantic model, returns the result of model.model_json_schema()
+        >>> # For TypedDict and dataclasses, generates appropriate schema
+    """
+    # Dispatch straight to the handler for the type's category
+    handler = _TYPE_HANDLERS.get(_classify_type(type_hint))
+    if handler is not None:
+        return handler(type_hint)
+
+    # Default to object for complex types or unrecognized types
+    return _OBJECT_SCHEMA
+
+
+def generate_schema_original_method(func: Function) -> dict[str, Any]:
+    """Original implementation - kept as fallback in case TypeAdapter approach fails."""
+    # Get function signature
+    sig = _get_signature(func)
+
+    # Prepare schema structure
+    schema = {
+        "type": "object",
+        "properties": {},
+        "required": [],
+    }
+
+    # Process each parameter
+    for name, param in sig.parameters.items():
+        # Skip 'self' parameter for methods
+        if name == "self" and len(sig.parameters) > 0:
+            continue
+
+        # Determine type (use Any if no annotation)
+        type_hint = (
+            param.annotation if param.annotation != inspect.Parameter.empty else Any
+        )
+
+        # Generate schema for the parameter (copied, it is enriched below)
+        param_schema = dict(type_to_json_schema(type_hint))
+
+        # Add parameter description from docstring if available
+        if func.__doc__:
+            param_desc = _parse_param_docs(func.__doc__).get(name)
+            if param_desc is not None:
+                param_schema["description"] = param_desc
+
+        # Add default value to schema if provided
+        if param.default != inspect.Parameter.empty and param.default is not None:
+            param_schema["default"] = param.default
+
+        # Add to properties
+        # pyre-ignore: Undefined attribute [16]: Item `str` of `typing.Union[Dict[typing.Any, typing.Any], typing.List[typing.Any], str]` has no attribute `__setitem__`.
+        schema["properties"][name] = param_schema
+
+        # Add to required if no default value
+        if param.default == inspect.Parameter.empty:
+            # pyre-ignore: Undefined attribute [16]: Item `Dict` of `typing.Union[Dict[typing.Any, typing.Any], typing.List[typing.Any], str]` has no attribute `append`.
+            schema["required"].append(name)
+
+    return schema
@@ -1,12 +1,15 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # pyre-strict
 
+import copy
 import inspect
 import json
+import os
 import re
 import types
+import weakref
 from dataclasses import fields as dc_fields, is_dataclass
-from functools import wraps
+from functools import lru_cache, wraps
 
 from typing import (
     Any,
@@ -14,10 +17,8 @@ from typing import (
     Awaitable,
     Callable,
     Dict,
-    get_args,
     get_origin,
     get_type_hints,
-    List,
     Literal,
     Type,
     TypeVar,
@@ -40,6 +41,130 @@ UnionTypeAlias = types.UnionType  # For Python 3.10+
 # Type alias for primitive types in JSON schema
 PythonPrimitiveType = Type[str] | Type[int] | Type[float] | Type[bool]
 
+# Type classification tags used to dispatch schema generation and kwargs conversion
+_TYPE_PRIMITIVE = 0
+_TYPE_UNION = 1
+_TYPE_LIST = 2
+_TYPE_DICT = 3
+_TYPE_LITERAL = 4
+_TYPE_PYDANTIC = 5
+_TYPE_TYPED_DICT = 6
+_TYPE_DATACLASS = 7
+_TYPE_OTHER = 8
+
+_PRIMITIVE_TYPES: tuple[object, ...] = (str, int, float, bool, None, type(None))
+
+
+def _compute_type_tag(type_hint: object) -> int:
+    """
+    Classify a type hint into one of the `_TYPE_*` tags.
+
+    The checks run in the same order the schema handlers used to be tried in,
+    so the first matching category wins.
+
+    Args:
+        type_hint: Python type annotation to classify
+
+    Returns:
+        The classification tag for the type hint
+    """
+    if any(type_hint is t for t in _PRIMITIVE_TYPES):
+        return _TYPE_PRIMITIVE
+    origin = get_origin(type_hint)
+    if isinstance(type_hint, UnionTypeAlias) or origin is Union:
+        return _TYPE_UNION
+    if origin is list or type_hint is list:
+        return _TYPE_LIST
+    if origin is dict or type_hint is dict:
+        return _TYPE_DICT
+    if origin is Literal:
+        return _TYPE_LITERAL
+    if isinstance(type_hint, type):
+        if BaseModel in type_hint.__mro__:
+            return _TYPE_PYDANTIC
+        if hasattr(type_hint, "__annotations__") and isinstance(
+            getattr(type_hint, "__total__", None), bool
+        ):  # TypedDict marker
+            return _TYPE_TYPED_DICT
+        if is_dataclass(type_hint):
+            return _TYPE_DATACLASS
+    return _TYPE_OTHER
+
+
+_cached_type_tag: Callable[[object], int] = lru_cache(maxsize=4096)(_compute_type_tag)
+
+
+def _classify_type(type_hint: object) -> int:
+    """
+    Classify a type hint, caching the result for hashable type hints.
+
+    Args:
+        type_hint: Python type annotation to classify
+
+    Returns:
+        The classification tag for the type hint
+    """
+    try:
+        return _cached_type_tag(type_hint)
+    except TypeError:
+        # Unhashable annotations (e.g. Annotated with dict metadata) skip the cache
+        return _compute_type_tag(type_hint)
+
+
+# Keyed weakly, so that functions created per call (e.g. closures over a context)
+# are not kept alive by the caches
+_signature_cache: "weakref.WeakKeyDictionary[Function, inspect.Signature]" = (
+    weakref.WeakKeyDictionary()
+)
+_type_hints_cache: "weakref.WeakKeyDictionary[Function, dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_cached(
+    cache: "weakref.WeakKeyDictionary[Function, T]",
+    func: Function,
+    compute: Callable[[Function], T],
+) -> T:
+    try:
+        return cache[func]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable or not weak-referenceable callable, e.g. a method bound
+        # to an unhashable instance
+        return compute(func)
+
+    value = compute(func)
+    cache[func] = value
+    return value
+
+
+def _get_signature(func: Function) -> inspect.Signature:
+    """
+    Get the signature of a function, cached across the wrapper and schema paths.
+
+    Args:
+        func: The function to inspect
+
+    Returns:
+        The function signature
+    """
+    return _get_cached(_signature_cache, func, inspect.signature)
+
+
+def _get_type_hints(func: Function) -> dict[str, Any]:
+    """
+    Get the resolved type hints of a function, cached across schema generations.
+
+    Args:
+        func: The function to inspect
+
+    Returns:
+        The resolved type hints (shared, do not modify)
+    """
+    return _get_cached(_type_hints_cache, func, get_type_hints)
+
 
 def get_runnable(func: Function, name: str | None = None) -> RunnableLambda:
     """
@@ -55,8 +180,88 @@ def get_runnable(func: Function, name: str | None = None) -> RunnableLambda:
     return RunnableLambda(get_single_kwargs_function(func), name=name)
 
 
+KwargsConverter = Callable[[Dict[str, Any]], Any]
+
+# Sentinel for parameters absent from the input dictionary
+_MISSING_ARG = object()
+
+
+def _get_pydantic_converter(model_type: Type[BaseModel]) -> KwargsConverter:
+    """
+    Build a converter that instantiates a pydantic model from a dictionary.
+
+    Args:
+        model_type: The pydantic model to instantiate
+
+    Returns:
+        A function converting a dictionary to an instance of the model
+    """
+    return lambda value: model_type(**value)
+
+
+def _get_dataclass_converter(dataclass_type: type) -> KwargsConverter:
+    """
+    Build a converter that instantiates a dataclass from a dictionary.
+
+    Keys that are not fields of the dataclass are filtered out.
+
+    Args:
+        dataclass_type: The dataclass to instantiate
+
+    Returns:
+        A function converting a dictionary to an instance of the dataclass
+    """
+    # Get all field names defined in the dataclass
+    field_names = frozenset(f.name for f in dc_fields(dataclass_type))
+
+    def convert(value: Dict[str, Any]) -> Any:
+        # Only include keys that exist in the dataclass
+        return dataclass_type(**{k: v for k, v in value.items() if k in field_names})
+
+    return convert
+
+
+def _get_kwargs_converters(
+    signature: inspect.Signature,
+) -> tuple[tuple[str, KwargsConverter | None], ...]:
+    """
+    Resolve, once per function, how each parameter's dictionary value should be converted.
+
+    Args:
+        signature: The function signature with parameter type information
+
+    Returns:
+        (parameter name, converter) pairs in signature order. The converter is None
+        when dictionary values are passed through unchanged.
+    """
+    converters = []
+    for name, param in signature.parameters.items():
+        # Skip 'self' parameter for methods
+        if name == "self":
+            converters.append((name, None))
+            continue
+
+        # Get parameter type annotation
+        param_type = (
+            param.annotation if param.annotation != inspect.Parameter.empty else Any
+        )
+        type_tag = _classify_type(param_type)
+        # Handle pydantic BaseModel
+        if type_tag == _TYPE_PYDANTIC:
+            converters.append((name, _get_pydantic_converter(param_type)))
+        # Handle dataclasses - filter out fields that don't exist in the dataclass
+        elif type_tag == _TYPE_DATACLASS:
+            converters.append((name, _get_dataclass_converter(param_type)))
+        # For TypedDict, we can use the dict directly (it's just a dict with type hints)
+        # For other types, use as is
+        else:
+            converters.append((name, None))
+    return tuple(converters)
+
+
 def _convert_kwargs_to_typed_params(
-    kwargs: Dict[str, Any], signature: inspect.Signature
+    kwargs: Dict[str, Any],
+    converters: tuple[tuple[str, KwargsConverter | None], ...],
 ) -> Dict[str, Any]:
     """
     Convert dictionary arguments to their corresponding types based on function parameter annotations.
@@ -65,52 +270,159 @@ def _convert_kwargs_to_typed_params(
 
     Args:
         kwargs: The dictionary of arguments
-        signature: The function signature with parameter type information
+        converters: Per-parameter converters from `_get_kwargs_converters`
 
     Returns:
         The converted arguments dictionary
     """
     converted_kwargs = {}
-    for name, param in signature.parameters.items():
-        if name in kwargs:
-            # Skip 'self' parameter for methods
-            if name == "self":
-                converted_kwargs[name] = kwargs[name]
-                continue
-
-            # Get parameter type annotation
-            param_type = (
-                param.annotation if param.annotation != inspect.Parameter.empty else Any
-            )
-            param_value = kwargs[name]
-
-            # Only attempt conversion if we have a dict value and a valid type annotation
-            if isinstance(param_value, dict):
-                # Handle pydantic BaseModel
-                if isinstance(param_type, type) and issubclass(param_type, BaseModel):
-                    converted_kwargs[name] = param_type(**param_value)
-
-                # Handle dataclasses - filter out fields that don't exist in the dataclass
-                elif isinstance(param_type, type) and is_dataclass(param_type):
-                    # Get all field names defined in the dataclass
-                    field_names = {f.name for f in dc_fields(param_type)}
-                    # Only include keys that exist in the dataclass
-                    filtered_param_value = {
-                        k: v for k, v in param_value.items() if k in field_names
-                    }
-                    converted_kwargs[name] = param_type(**filtered_param_value)
-
-                # For TypedDict, we can use the dict directly (it's just a dict with type hints)
-                # For other types, use as is
-                else:
-                    converted_kwargs[name] = param_value
-            else:
-                converted_kwargs[name] = param_value
+    get = kwargs.get
+    for name, converter in converters:
+        param_value = get(name, _MISSING_ARG)
         # If parameter not provided in kwargs, leave it out (will use default or raise error)
+        if param_value is _MISSING_ARG:
+            continue
+        # Only attempt conversion if we have a dict value and a converter
+        if converter is not None and isinstance(param_value, dict):
+            converted_kwargs[name] = converter(param_value)
+        else:
+            converted_kwargs[name] = param_value
 
     return converted_kwargs
 
 
+def _get_kwargs_preparer(
+    signature: inspect.Signature,
+    converters: tuple[tuple[str, KwargsConverter | None], ...],
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Get the function used to turn the wrapper's input dictionary into call arguments.
+
+    When no parameter needs conversion, the input dictionary is passed through
+    as-is (only dropping keys that are not parameters of the function), which
+    skips the per-parameter conversion loop entirely.
+
+    Args:
+        signature: The function signature with parameter type information
+        converters: Per-parameter converters from `_get_kwargs_converters`
+
+    Returns:
+        A function mapping the input dictionary to the keyword arguments of the call
+    """
+    if any(converter is not None for _, converter in converters):
+        return lambda kwargs: _convert_kwargs_to_typed_params(kwargs, converters)
+
+    param_names = frozenset(signature.parameters)
+
+    def passthrough(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if kwargs.keys() <= param_names:
+            return kwargs
+        return {k: v for k, v in kwargs.items() if k in param_names}
+
+    return passthrough
+
+
+def _env_flag(name: str) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return False
+    return value.strip().lower() in {"1", "true", "on", "yes"}
+
+
+def _generate_single_kwargs_wrapper(
+    func: Function,
+    signature: inspect.Signature,
+    converters: tuple[tuple[str, KwargsConverter | None], ...],
+    prepare_kwargs: Callable[[Dict[str, Any]], Dict[str, Any]],
+) -> Function | None:
+    """
+    Generate a wrapper specialized to the function signature.
+
+    The parameter names, defaults and converters are burnt into straight-line
+    source code that is compiled once, so calling the wrapper does not loop over
+    the parameters. If a required parameter is missing from the input, the call
+    falls back to `prepare_kwargs` so the function reports the error itself.
+
+    Args:
+        func: The function to wrap
+        signature: The function signature
+        converters: Per-parameter converters from `_get_kwargs_converters`
+        prepare_kwargs: The generic argument preparer used as fallback
+
+    Returns:
+        The generated wrapper, or None if the signature is not supported
+    """
+    namespace: dict[str, Any] = {
+        "_func": func,
+        "_prepare_kwargs": prepare_kwargs,
+    }
+    call_args = []
+    required = []
+    for index, ((name, converter), param) in enumerate(
+        zip(converters, signature.parameters.values())
+    ):
+        if param.kind not in (
+            inspect.Parameter.POSITIONAL_OR_KEYWORD,
+            inspect.Parameter.KEYWORD_ONLY,
+        ):
+            return None
+
+        if param.default is inspect.Parameter.empty:
+            required.append(name)
+            value = f"kwargs[{name!r}]"
+        else:
+            if converter is not None and isinstance(param.default, dict):
+                # The default must not go through the converter
+                return None
+            namespace[f"_d{index}"] = param.default
+            value = f"kwargs.get({name!r}, _d{index})"
+
+        if converter is not None:
+            namespace[f"_c{index}"] = converter
+            value = f"_c{index}(_v) if isinstance(_v := {value}, dict) else _v"
+        call_args.append(f"{name}={value}")
+    namespace["_required"] = frozenset(required)
+
+    call = f"_func({', '.join(call_args)})"
+    # Bind everything the wrapper uses as default arguments for fast local lookups
+    params = ", ".join(["kwargs", *(f"{key}={key}" for key in namespace)])
+    fallback = "_func(**_prepare_kwargs(kwargs))"
+    if is_async_generator(func):
+        header = f"async def wrapper({params}):"
+        body = [
+            "if _required <= kwargs.keys():",
+            f"    items = {call}",
+            "else:",
+            f"    items = {fallback}",
+            "async for item in items:",
+            "    yield item",
+        ]
+    elif is_async_callable(func):
+        header = f"async def wrapper({params}):"
+        body = [
+            "if _required <= kwargs.keys():",
+            f"    return await {call}",
+            f"return await {fallback}",
+        ]
+    else:
+        header = f"def wrapper({params}):"
+        body = [
+            "if _required <= kwargs.keys():",
+            f"    return {call}",
+            f"return {fallback}",
+        ]
+
+    lines = [
+        header,
+        "    if not isinstance(kwargs, dict):",
+        '        raise TypeError("Argument must be a dictionary")',
+        *(f"    {line}" for line in body),
+    ]
+    wrapper_namespace = dict(namespace)
+    exec("\n".join(lines), wrapper_namespace)
+    return wraps(func)(wrapper_namespace["wrapper"])
+
+
 def get_single_kwargs_function(func: Function) -> Function:
     """
     Convert a function that takes multiple keyword arguments to a function that takes a single dictionary of keyword arguments.
@@ -126,22 +438,38 @@ def get_single_kwargs_function(func: Function) -> Function:
     Returns:
         A new function that takes a single dictionary of keyword arguments
     """
-    # Get function signature outside of the wrapper to avoid capturing it
-    func_sig = inspect.signature(func)
+    # Resolve argument conversion outside of the wrapper to avoid redoing it per call.
+    # The wrappers bind it through default arguments, the fastest lookup for a call.
+    func_sig = _get_signature(func)
+    converters = _get_kwargs_converters(func_sig)
+    prepare_kwargs = _get_kwargs_preparer(func_sig, converters)
+
+    if _env_flag("CCA_CODEGEN_WRAPPERS"):
+        generated = _generate_single_kwargs_wrapper(
+            func, func_sig, converters, prepare_kwargs
+        )
+        if generated is not None:
+            return generated
 
     if is_async_generator(func):
 
         @wraps(func)
         # pyre-ignore: Missing return annotation [3]: Return type must be specified as type other than `Any`.
-        async def async_gen_wrapper(kwargs: Dict[str, Any]) -> AsyncIterator[Any]:
+        async def async_gen_wrapper(
+            kwargs: Dict[str, Any],
+            _prepare_kwargs: Callable[
+                [Dict[str, Any]], Dict[str, Any]
+            ] = prepare_kwargs,
+            _func: Function = func,
+        ) -> AsyncIterator[Any]:
             if not isinstance(kwargs, dict):
                 raise TypeError("Argument must be a dictionary")
 
             # Convert arguments based on type annotations
-            converted_kwargs = _convert_kwargs_to_typed_params(kwargs, func_sig)
+            converted_kwargs = _prepare_kwargs(kwargs)
 
             # Call the function with converted arguments
-            async for item in func(**converted_kwargs):
+            async for item in _func(**converted_kwargs):
                 yield item
 
         return async_gen_wrapper
@@ -149,298 +477,188 @@ def get_single_kwargs_function(func: Function) -> Function:
 
         @wraps(func)
         # pyre-ignore: Missing return annotation [3]: Return type must be specified as type other than `Any`.
-        async def async_wrapper(kwargs: Dict[str, Any]) -> Any:
+        async def async_wrapper(
+            kwargs: Dict[str, Any],
+            _prepare_kwargs: Callable[
+                [Dict[str, Any]], Dict[str, Any]
+            ] = prepare_kwargs,
+            _func: Function = func,
+        ) -> Any:
             if not isinstance(kwargs, dict):
                 raise TypeError("Argument must be a dictionary")
 
             # Convert arguments based on type annotations
-            converted_kwargs = _convert_kwargs_to_typed_params(kwargs, func_sig)
+            converted_kwargs = _prepare_kwargs(kwargs)
 
             # Call the function with converted arguments
-            return await func(**converted_kwargs)
+            return await _func(**converted_kwargs)
 
         return async_wrapper
     else:
 
         @wraps(func)
         # pyre-ignore: Missing return annotation [3]: Return type must be specified as type other than `Any`.
-        def sync_wrapper(kwargs: Dict[str, Any]) -> Any:
+        def sync_wrapper(
+            kwargs: Dict[str, Any],
+            _prepare_kwargs: Callable[
+                [Dict[str, Any]], Dict[str, Any]
+            ] = prepare_kwargs,
+            _func: Function = func,
+        ) -> Any:
             if not isinstance(kwargs, dict):
                 raise TypeError("Argument must be a dictionary")
 
             # Convert arguments based on type annotations
-            converted_kwargs = _convert_kwargs_to_typed_params(kwargs, func_sig)
+            converted_kwargs = _prepare_kwargs(kwargs)
 
             # Call the function with converted arguments
-            return func(**converted_kwargs)
+            return _func(**converted_kwargs)
 
         return sync_wrapper
 
 
-AllTypes = (
-    PythonPrimitiveType
-    | UnionTypeAlias
-    | Type[List[Any]]
-    | Type[Dict[str, Any]]
-    | Type[object]  # For custom types
+# `name: description` entries of a docstring. The description is captured in a
+# lookahead so that entries mentioned inside another description are still found.
+_PARAM_DOC_PATTERN: re.Pattern[str] = re.compile(
+    r"(?<=\s)(\w+):(?=\s*(.*?)$)", re.MULTILINE | re.DOTALL
 )
 
 
-def _handle_primitive_type(type_hint: AllTypes) -> Dict[str, Any] | None:
+@lru_cache(maxsize=2048)
+def _parse_param_docs(docstring: str) -> dict[str, str]:
     """
-    Handle primitive types in JSON schema conversion.
+    Parse parameter descriptions from a docstring in a single pass.
 
     Args:
-        type_hint: Python primitive type
+        docstring: The docstring to parse
 
     Returns:
-        JSON schema for the primitive type or None if not a primitive type
-    """
-    if type_hint is str:
-        return {"type": "string"}
-    elif type_hint is int:
-        return {"type": "integer"}
-    elif type_hint is float:
-        return {"type": "number"}
-    elif type_hint is bool:
-        return {"type": "boolean"}
-    elif type_hint is None or type_hint is type(None):
-        return {"type": "null"}
-    return None
-
-
-def _handle_union_type(type_hint: AllTypes) -> Dict[str, Any] | None:
+        Mapping of parameter name to its description, first occurrence wins
+        (shared, do not modify)
     """
-    Handle Union types in JSON schema conversion.
-
-    Args:
-        type_hint: Python Union type
-
-    Returns:
-        JSON schema for the Union type or None if not a Union type
-    """
-    origin = get_origin(type_hint)
-    if isinstance(type_hint, UnionTypeAlias) or origin is Union:
-        args = get_args(type_hint)
-        if type(None) in args:
-            # If this is an Optional type (T | None), get the non-None type
-            args = [arg for arg in args if arg is not type(None)]
-        if len(args) == 1:
-            return type_to_json_schema(args[0])
+    param_docs: dict[str, str] = {}
+    for match in _PARAM_DOC_PATTERN.finditer(docstring):
+        param_docs.setdefault(match.group(1), match.group(2).strip())
+    return param_docs
 
-        # Handle union of multiple types
-        any_of = [type_to_json_schema(t) for t in args]
-        return {"anyOf": any_of}
-    return None
 
-
-def _handle_list_type(type_hint: AllTypes) -> Dict[str, Any] | None:
+def _enhance_schema_with_metadata(schema: dict[str, Any], func: Function) -> None:
     """
-    Handle List types in JSON schema conversion.
+    Enhance schema properties with docstring descriptions and default values.
 
     Args:
-        type_hint: Python List type
-
-    Returns:
-        JSON schema for the List type or None if not a List type
+        schema: Base schema to enhance (modified in-place)
+        func: Function to extract metadata from
     """
-    origin = get_origin(type_hint)
-    if origin is list or type_hint is list:
-        # If generic type is provided, use it; otherwise, default to any
-        item_type = get_args(type_hint)
-        item_schema = (
-            type_to_json_schema(item_type[0]) if item_type else {"type": "object"}
-        )
-        return {"type": "array", "items": item_schema}
-    return None
-
+    if "properties" not in schema:
+        return
 
-def _handle_dict_type(type_hint: AllTypes) -> Dict[str, Any] | None:
-    """
-    Handle Dict types in JSON schema conversion.
+    sig = _get_signature(func)
+    for name, param in sig.parameters.items():
+        if name == "self" or name not in schema["properties"]:
+            continue
 
-    Args:
-        type_hint: Python Dict type
+        # Add docstring description if available
+        if func.__doc__:
+            param_desc = _parse_param_docs(func.__doc__).get(name)
+            if param_desc is not None:
+                schema["properties"][name] = {
+                    **schema["properties"][name],
+                    "description": param_desc,
+                }
 
-    Returns:
-        JSON schema for the Dict type or None if not a Dict type
-    """
-    origin = get_origin(type_hint)
-    if origin is dict or type_hint is dict:
-        # Maintain compatibility with existing tests by always returning simple object schema
-        return {"type": "object"}
-    return None
+        # Add default value if present
+        if param.default != inspect.Parameter.empty and param.default is not None:
+            schema["properties"][name] = {
+                **schema["properties"][name],
+                "default": param.default,
+            }
 
 
-def _handle_literal_type(type_hint: AllTypes) -> Dict[str, Any] | None:
+def _is_type_adapter_compatible(param_type: object) -> bool:
     """
-    Handle Literal types in JSON schema conversion.
+    Check whether pydantic can build a TypeAdapter for a type.
 
     Args:
-        type_hint: Python Literal type
+        param_type: Python type annotation to probe
 
     Returns:
-        JSON schema for the Literal type or None if not a Literal type
+        True if a TypeAdapter can be constructed for the type
     """
-    origin = get_origin(type_hint)
-    if origin is Literal:
-        literal_values = get_args(type_hint)
-        # Ensure all values are of the same type
-        if literal_values and all(
-            isinstance(val, type(literal_values[0])) for val in literal_values
-        ):
-            base_schema = type_to_json_schema(type(literal_values[0]))
-            base_schema["enum"] = list(literal_values)
-            return base_schema
-        return {"enum": list(literal_values)}
-    return None
+    try:
+        # pyre-ignore: Incompatible parameter type [6]
+        TypeAdapter(param_type)
+        return True
+    except Exception:
+        return False
 
 
-def _handle_pydantic_model(type_hint: AllTypes) -> Dict[str, Any] | None:
-    """
-    Handle pydantic BaseModel types in JSON schema conversion.
-
-    Args:
-        type_hint: Python pydantic BaseModel type
-
-    Returns:
-        JSON schema for the pydantic BaseModel or None if not a pydantic BaseModel
-    """
-    if isinstance(type_hint, type) and issubclass(type_hint, BaseModel):
-        # For pydantic models, we can directly use the schema() method
-        return type_hint.schema()
-    return None
+_cached_type_adapter_compatible: Callable[[object], bool] = lru_cache(maxsize=None)(
+    _is_type_adapter_compatible
+)
 
 
-def _handle_typed_dict(type_hint: AllTypes) -> Dict[str, Any] | None:
+def _probe_type_adapter(param_type: object) -> bool:
     """
-    Handle TypedDict types in JSON schema conversion.
+    Cached variant of `_is_type_adapter_compatible` for hashable types.
 
     Args:
-        type_hint: Python TypedDict type
+        param_type: Python type annotation to probe
 
     Returns:
-        JSON schema for the TypedDict type or None if not a TypedDict
+        True if a TypeAdapter can be constructed for the type
     """
-    if isinstance(type_hint, type) and hasattr(type_hint, "__annotations__"):
-        if isinstance(getattr(type_hint, "__total__", None), bool):  # TypedDict marker
-            properties = {}
-            required = []
+    try:
+        return _cached_type_adapter_compatible(param_type)
+    except TypeError:
+        return _is_type_adapter_compatible(param_type)
 
-            for field_name, field_type in type_hint.__annotations__.items():
-                properties[field_name] = type_to_json_schema(field_type)
 
-                # Check if this field is required (all fields are required by default unless using NotRequired)
-                if getattr(type_hint, "__total__", True) or field_name in getattr(
-                    type_hint, "__required_keys__", {field_name}
-                ):
-                    required.append(field_name)
-
-            return {"type": "object", "properties": properties, "required": required}
-    return None
-
-
-def _handle_dataclass(type_hint: AllTypes) -> Dict[str, Any] | None:
+def _build_signature_schema(
+    signature_key: tuple[tuple[str, object], ...], func_name: str
+) -> dict[str, Any]:
     """
-    Handle dataclass types in JSON schema conversion.
+    Build the TypeAdapter JSON schema for a set of (parameter name, type) pairs.
 
     Args:
-        type_hint: Python dataclass type
+        signature_key: Ordered (parameter name, type) pairs of the function
+        func_name: Name of the function, used to name the generated TypedDict
 
     Returns:
-        JSON schema for the dataclass type or None if not a dataclass
+        JSON schema generated by pydantic for the parameters
     """
-    if isinstance(type_hint, type) and is_dataclass(type_hint):
-        properties = {}
-        required = []
-
-        for field in dc_fields(type_hint):
-            properties[field.name] = type_to_json_schema(field.type)
+    # pyre-ignore: TypedDict callable annotation issue
+    FunctionArgsType = TypedDict(f"{func_name}Args", dict(signature_key))
+    adapter = TypeAdapter(FunctionArgsType)
+    return adapter.json_schema()
 
-            # For dataclasses, fields without a default are required
-            # In dataclasses, fields without default have default=dataclasses.MISSING
-            # inspect.Parameter.empty is a placeholder we're using for comparison
-            if field.default == field.default_factory:  # Both are default values
-                # If both are equal, it means neither has been set (both are MISSING)
-                required.append(field.name)
 
-        return {"type": "object", "properties": properties, "required": required}
-    return None
+_cached_signature_schema: Callable[
+    [tuple[tuple[str, object], ...], str], dict[str, Any]
+] = lru_cache(maxsize=None)(_build_signature_schema)
 
 
-def type_to_json_schema(type_hint: AllTypes) -> Dict[str, Any]:
+def _schema_for_signature(
+    signature_key: tuple[tuple[str, object], ...], func_name: str
+) -> dict[str, Any]:
     """
-    Convert Python type hints to JSON Schema representation.
+    Get a fresh copy of the TypeAdapter JSON schema for a function signature.
 
-    Supports primitive types, Union types (both Union[T, None] and T | None syntax),
-    Lists, Dictionaries, pydantic BaseModel, TypedDict, dataclasses, and gracefully
-    handles other complex types.
+    Schemas are cached per unique signature, so the copy returned here is safe
+    for the caller to mutate.
 
     Args:
-        type_hint: Python type annotation to convert to JSON schema
+        signature_key: Ordered (parameter name, type) pairs of the function
+        func_name: Name of the function, used to name the generated TypedDict
 
     Returns:
-        Dictionary representing JSON Schema for the type
-
-    Examples:
-        >>> type_to_json_schema(str)
-        {'type': 'string'}
-        >>> type_to_json_schema(Optional[int])  # or int | None in Python 3.10+
-        {'type': 'integer'}
-        >>> type_to_json_schema(List[str])
-        {'type': 'array', 'items': {'type': 'string'}}
-        >>> # For a pydantic model, returns the result of model.schema()
-        >>> # For TypedDict and dataclasses, generates appropriate schema
-    """
-    # Try each handler in sequence
-    for handler in [
-        _handle_primitive_type,
-        _handle_union_type,
-        _handle_list_type,
-        _handle_dict_type,
-        _handle_literal_type,
-        _handle_pydantic_model,
-        _handle_typed_dict,
-        _handle_dataclass,
-    ]:
-        result = handler(type_hint)
-        if result is not None:
-            return result
-
-    # Default to object for complex types or unrecognized types
-    return {"type": "object"}
-
-
-def _enhance_schema_with_metadata(schema: dict[str, Any], func: Function) -> None:
+        JSON schema generated by pydantic for the parameters
     """
-    Enhance schema properties with docstring descriptions and default values.
-
-    Args:
-        schema: Base schema to enhance (modified in-place)
-        func: Function to extract metadata from
-    """
-    if "properties" not in schema:
-        return
-
-    sig = inspect.signature(func)
-    for name, param in sig.parameters.items():
-        if name == "self" or name not in schema["properties"]:
-            continue
-
-        # Add docstring description if available
-        if func.__doc__:
-            param_desc_match = re.search(
-                rf"\s+{name}:\s*(.*?)(?:\n\s+\w+:|$)",
-                func.__doc__,
-                re.MULTILINE | re.DOTALL,
-            )
-            if param_desc_match:
-                param_desc = param_desc_match.group(1).strip()
-                schema["properties"][name]["description"] = param_desc
-
-        # Add default value if present
-        if param.default != inspect.Parameter.empty and param.default is not None:
-            schema["properties"][name]["default"] = param.default
+    try:
+        schema = _cached_signature_schema(signature_key, func_name)
+    except TypeError:
+        return _build_signature_schema(signature_key, func_name)
+    return copy.deepcopy(schema)
 
 
 def _generate_unified_schema_with_typeadapter(func: Function) -> dict[str, Any]:
@@ -457,11 +675,11 @@ def _generate_unified_schema_with_typeadapter(func: Function) -> dict[str, Any]:
     Returns:
         dict: JSON schema with proper $defs section and graceful fallback for incompatible types
     """
-    sig = inspect.signature(func)
-    type_hints = get_type_hints(func)
+    sig = _get_signature(func)
+    type_hints = _get_type_hints(func)
 
     # Build unified type representing all function parameters
-    field_definitions = {}
+    field_definitions = []
     required_fields = []
 
     for name, param in sig.parameters.items():
@@ -470,21 +688,17 @@ def _generate_unified_schema_with_typeadapter(func: Function) -> dict[str, Any]:
 
         param_type = type_hints.get(name, Any)
 
-        try:
-            TypeAdapter(param_type)
-            field_definitions[name] = param_type
-        except Exception:
+        if _probe_type_adapter(param_type):
+            field_definitions.append((name, param_type))
+        else:
             # Use dict as substitute - generates proper object schema with additionalProperties
-            field_definitions[name] = dict
+            field_definitions.append((name, dict))
 
         if param.default == inspect.Parameter.empty:
             required_fields.append(name)
 
     # Create TypedDict and generate schema using TypeAdapter
-    # pyre-ignore: TypedDict callable annotation issue
-    FunctionArgsType = TypedDict(f"{func.__name__}Args", field_definitions)
-    adapter = TypeAdapter(FunctionArgsType)
-    schema = adapter.json_schema()
+    schema = _schema_for_signature(tuple(field_definitions), func.__name__)
 
     # Add required fields (TypedDict doesn't preserve this from function signature)
     schema["required"] = required_fields
@@ -495,59 +709,6 @@ def _generate_unified_schema_with_typeadapter(func: Function) -> dict[str, Any]:
     return schema
 
 
-def _generate_schema_original_method(func: Function) -> dict[str, Any]:
-    """Original implementation - kept as fallback in case TypeAdapter approach fails."""
-    # Get function signature
-    sig = inspect.signature(func)
-
-    # Prepare schema structure
-    schema = {
-        "type": "object",
-        "properties": {},
-        "required": [],
-    }
-
-    # Process each parameter
-    for name, param in sig.parameters.items():
-        # Skip 'self' parameter for methods
-        if name == "self" and len(sig.parameters) > 0:
-            continue
-
-        # Determine type (use Any if no annotation)
-        type_hint = (
-            param.annotation if param.annotation != inspect.Parameter.empty else Any
-        )
-
-        # Generate schema for the parameter
-        param_schema = type_to_json_schema(type_hint)
-
-        # Add parameter description from docstring if available
-        if func.__doc__:
-            param_desc_match = re.search(
-                rf"\s+{name}:\s*(.*?)(?:\n\s+\w+:|$)",
-                func.__doc__,
-                re.MULTILINE | re.DOTALL,
-            )
-            if param_desc_match:
-                param_desc = param_desc_match.group(1).strip()
-                param_schema["description"] = param_desc
-
-        # Add default value to schema if provided
-        if param.default != inspect.Parameter.empty and param.default is not None:
-            param_schema["default"] = param.default
-
-        # Add to properties
-        # pyre-ignore: Undefined attribute [16]: Item `str` of `typing.Union[Dict[typing.Any, typing.Any], typing.List[typing.Any], str]` has no attribute `__setitem__`.
-        schema["properties"][name] = param_schema
-
-        # Add to required if no default value
-        if param.default == inspect.Parameter.empty:
-            # pyre-ignore: Undefined attribute [16]: Item `Dict` of `typing.Union[Dict[typing.Any, typing.Any], typing.List[typing.Any], str]` has no attribute `append`.
-            schema["required"].append(name)
-
-    return schema
-
-
 def generate_function_json_schema_dict(func: Function) -> dict[str, Any]:
     """
     Generate JSON schema for a function's parameters.
@@ -575,20 +736,35 @@ def generate_function_json_schema_dict(func: Function) -> dict[str, Any]:
         >>> "age" in schema["required"]
         False
     """
-    use_typeadapter = True
-
-    if use_typeadapter:
-        # Use new TypeAdapter approach
-        return _generate_unified_schema_with_typeadapter(func)
-    else:
+    if _env_flag("CCA_LEGACY_SCHEMA"):
         # Use original method (kept for backward compatibility)
-        return _generate_schema_original_method(func)
+        from .schema_legacy import generate_schema_original_method
+
+        return generate_schema_original_method(func)
+
+    # Use new TypeAdapter approach
+    return _generate_unified_schema_with_typeadapter(func)
+
+
+def _dump_function_json_schema(
+    func: Function, dumps_kwargs: tuple[tuple[str, Any], ...]
+) -> str:
+    return json.dumps(generate_function_json_schema_dict(func), **dict(dumps_kwargs))
+
+
+# Serialized schemas per function and json.dumps arguments, keyed weakly by the
+# function like the signature cache
+_function_json_schema_cache: (
+    "weakref.WeakKeyDictionary[Function, dict[tuple[tuple[str, Any], ...], str]]"
+) = weakref.WeakKeyDictionary()
 
 
 def generate_function_json_schema(func: Function, **kwargs: Any) -> str:
     """
     Generate JSON schema for a function's parameters.
 
+    The serialized schema is cached per function and json.dumps arguments.
+
     Args:
         func: The function to generate schema for
         kwargs: Additional arguments to pass to json.dumps
@@ -596,5 +772,24 @@ def generate_function_json_schema(func: Function, **kwargs: Any) -> str:
     Returns:
         JSON schema as a string
     """
+    dumps_kwargs = tuple(sorted(kwargs.items()))
+    schemas = _get_cached(_function_json_schema_cache, func, lambda _: {})
+    try:
+        schema = schemas.get(dumps_kwargs)
+    except TypeError:
+        # Unhashable json.dumps arguments
+        return _dump_function_json_schema(func, dumps_kwargs)
+
+    if schema is None:
+        schema = schemas[dumps_kwargs] = _dump_function_json_schema(func, dumps_kwargs)
+    return schema
+
+
+def __getattr__(name: str) -> Any:
+    # The legacy type-hint based schema generator lives in its own module, which is
+    # only imported when used (PEP 562)
+    if name == "type_to_json_schema":
+        from .schema_legacy import type_to_json_schema
 
-    return json.dumps(generate_function_json_schema_dict(func), **kwargs)
+        return type_to_json_schema
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
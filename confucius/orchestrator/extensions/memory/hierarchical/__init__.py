@@ -2,28 +2,61 @@
 
 # pyre-strict
 
-from .extension import (
-    DeleteMemoryInput,
-    EditMemoryInput,
-    HierarchicalMemoryExtension,
-    ImportMemoryInput,
-    MemoryOperationResult,
-    ReadMemoryInput,
-    SearchMemoryInput,
-    WriteMemoryInput,
-)
-from .types import Memory, MemoryNode
-
-
-__all__: list[object] = [
-    DeleteMemoryInput,
-    EditMemoryInput,
-    HierarchicalMemoryExtension,
-    ImportMemoryInput,
-    Memory,
-    MemoryNode,
-    MemoryOperationResult,
-    ReadMemoryInput,
-    SearchMemoryInput,
-    WriteMemoryInput,
+import importlib
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .extension import (
+        DeleteMemoryInput,
+        EditMemoryInput,
+        HierarchicalMemoryExtension,
+        ImportMemoryInput,
+        MemoryOperationResult,
+        ReadMemoryInput,
+        SearchMemoryInput,
+        WriteMemoryInput,
+    )
+    from .types import Memory, MemoryNode
+
+
+# Exported names and the submodule defining them, imported on first access
+# (PEP 562) so that using the memory types does not load the whole extension
+_LAZY_EXPORTS: dict[str, str] = {
+    "DeleteMemoryInput": ".extension",
+    "EditMemoryInput": ".extension",
+    "HierarchicalMemoryExtension": ".extension",
+    "ImportMemoryInput": ".extension",
+    "Memory": ".types",
+    "MemoryNode": ".types",
+    "MemoryOperationResult": ".extension",
+    "ReadMemoryInput": ".extension",
+    "SearchMemoryInput": ".extension",
+    "WriteMemoryInput": ".extension",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_EXPORTS})
+
+
+__all__: list[str] = [
+    "DeleteMemoryInput",
+    "EditMemoryInput",
+    "HierarchicalMemoryExtension",
+    "ImportMemoryInput",
+    "Memory",
+    "MemoryNode",
+    "MemoryOperationResult",
+    "ReadMemoryInput",
+    "SearchMemoryInput",
+    "WriteMemoryInput",
 ]
@@ -0,0 +1,399 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+
+# pyre-strict
+
+import os
+import stat as stat_module
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+from pydantic_core import to_json
+
+from . import utils
+from .types import Memory, MemoryNode
+
+# Number of characters read to locate the frontmatter of a memory file
+FRONTMATTER_HEAD_SIZE = 4096
+
+
+@dataclass
+class _CachedFile:
+    """Parsed memory file, valid while the file's (st_mtime_ns, st_size) is unchanged."""
+
+    stamp: tuple[int, int]
+    tags: list[str]
+    content: str
+    # Serialized content, tags and children fields of the file's node
+    json_fields: Optional[str] = None
+    # Lowercased content of ASCII files, computed by the first content search
+    lowered_content: Optional[str] = None
+    # Content preview of the file's search results
+    content_preview: Optional[str] = None
+
+
+@dataclass
+class _CachedDir:
+    """Sorted (name, is_dir) subdirectories and memory files of a directory, valid while its st_mtime_ns is unchanged."""
+
+    mtime_ns: int
+    entries: list[tuple[str, bool]]
+
+
+def _dump_json(value: object) -> str:
+    return to_json(value).decode()
+
+
+@lru_cache(maxsize=1)
+def _get_read_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that reads memory files missing from the cache."""
+    return ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 1) * 4),
+        thread_name_prefix="memory_read",
+    )
+
+
+def _is_memory_file_name(name: str) -> bool:
+    # Same as `Path(name).suffix == ".md"`, which is empty for a bare ".md"
+    return name.endswith(".md") and len(name) > 3
+
+
+class MemoryTreeCache:
+    """
+    Filesystem scan cache for hierarchical memory.
+
+    Directory listings are reused while the directory's mtime is unchanged, and
+    parsed files (tags and content) while the file's mtime and size are unchanged,
+    so reloading the memory tree only lists changed directories and only reads and
+    parses changed files. Paths mutated by the extension itself are invalidated
+    explicitly, which also covers filesystems with coarse mtime resolution.
+
+    Loaded file nodes share the tags lists of the cached files rather than
+    copying them on every load, so these lists must not be mutated in place.
+    """
+
+    def __init__(self) -> None:
+        # Keyed by the string form of the paths, so that scanning only joins strings
+        self._files: dict[str, _CachedFile] = {}
+        self._dirs: dict[str, _CachedDir] = {}
+
+    def invalidate(self, path: Path, base_dir: Path) -> None:
+        """
+        Drop cached entries for a mutated path, its descendants and its ancestors.
+
+        Args:
+            path: The file or directory that was created, modified or deleted
+            base_dir: The memory base directory, the last ancestor to invalidate
+        """
+        path_str = str(path)
+        descendant_prefix = path_str + os.sep
+        for cache in (self._files, self._dirs):
+            for cached_path in [
+                p for p in cache if p == path_str or p.startswith(descendant_prefix)
+            ]:
+                del cache[cached_path]
+
+        parent = path.parent
+        while True:
+            self._dirs.pop(str(parent), None)
+            if parent == base_dir or parent == parent.parent:
+                break
+            parent = parent.parent
+
+    def _list_dir(self, path: str, mtime_ns: int) -> list[tuple[str, bool]]:
+        cached = self._dirs.get(path)
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            return cached.entries
+
+        # Only keep the entries that can become memory nodes, so that loads do not
+        # iterate over unrelated files on every call
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                is_dir = entry.is_dir()
+                if is_dir or _is_memory_file_name(entry.name):
+                    entries.append((entry.name, is_dir))
+        entries.sort()
+        self._dirs[path] = _CachedDir(mtime_ns=mtime_ns, entries=entries)
+        return entries
+
+    def _read_file(self, path: str, stat: os.stat_result) -> _CachedFile:
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+
+        # Read file content and parse the frontmatter from the head of the file,
+        # so that only the frontmatter slice is parsed and the body is not split
+        with open(path) as f:
+            head = f.read(FRONTMATTER_HEAD_SIZE)
+            parsed = utils.parse_frontmatter_head(head)
+            if parsed is None:
+                # Frontmatter longer than the head (or unterminated)
+                tags, clean_content = utils.parse_frontmatter(head + f.read())
+            else:
+                tags, offset = parsed
+                clean_content = head[offset:] + f.read()
+        cached = _CachedFile(stamp=stamp, tags=tags, content=clean_content)
+        self._files[path] = cached
+        return cached
+
+    def _read_pending(
+        self, pending: list[tuple[MemoryNode, str, os.stat_result]]
+    ) -> None:
+        """Read the files collected by `build_node` and fill in their nodes."""
+        if len(pending) > 1:
+            results = _get_read_executor().map(
+                lambda item: self._read_file(item[1], item[2]), pending
+            )
+        else:
+            results = map(lambda item: self._read_file(item[1], item[2]), pending)
+
+        for (node, _, _), cached in zip(pending, results):
+            node.content = cached.content
+            node.tags = cached.tags
+
+    def _dump_node_json(self, node: MemoryNode) -> str:
+        cached = self._files.get(str(node.path))
+        if (
+            cached is not None
+            and not node.children
+            and cached.content == node.content
+            and cached.tags == node.tags
+        ):
+            # Unchanged file, reuse its serialized content
+            if cached.json_fields is None:
+                cached.json_fields = (
+                    f',"content":{_dump_json(cached.content)}'
+                    f',"tags":{_dump_json(cached.tags)},"children":[]}}'
+                )
+            fields = cached.json_fields
+        else:
+            children = ",".join(self._dump_node_json(child) for child in node.children)
+            fields = (
+                f',"content":{_dump_json(node.content)}'
+                f',"tags":{_dump_json(node.tags)},"children":[{children}]}}'
+            )
+        return (
+            f'{{"path":{_dump_json(str(node.path))}'
+            f',"name":{_dump_json(node.name)}{fields}'
+        )
+
+    def dump_json(self, memory: Memory) -> str:
+        """
+        Serialize a memory tree to JSON, same as `memory.model_dump_json()`.
+
+        The serialized fields of unchanged files are reused, so only files
+        that changed since the last call are encoded again.
+
+        Args:
+            memory: The memory tree, usually returned by `load`
+
+        Returns:
+            The JSON representation of the memory tree
+        """
+        nodes = ",".join(self._dump_node_json(node) for node in memory.nodes)
+        return f'{{"nodes":[{nodes}]}}'
+
+    def may_contain(self, node: MemoryNode, literals: Sequence[str]) -> bool:
+        """
+        Check that a node's content contains all the literals of a content pattern.
+
+        The lowercased content is cached per file, so that searches check the
+        literals with substring searches, which are much cheaper than
+        case-insensitive regex searches.
+
+        Args:
+            node: A node of a tree returned by `load`
+            literals: Literals from `utils.get_content_pattern_literals`
+
+        Returns:
+            False if the node's content cannot match the content pattern of the
+            literals, True if it may match
+        """
+        if not literals:
+            return True
+
+        cached = self._files.get(str(node.path))
+        if cached is None or node.children or cached.content != node.content:
+            return True
+        if not cached.content.isascii():
+            return True
+        if cached.lowered_content is None:
+            cached.lowered_content = cached.content.lower()
+        lowered_content = cached.lowered_content
+        return all(literal in lowered_content for literal in literals)
+
+    def content_preview(self, node: MemoryNode) -> str:
+        """
+        Get the search result preview of a node's content, cached per file.
+
+        Args:
+            node: A node of a tree returned by `load`
+
+        Returns:
+            The preview, same as `utils.get_content_preview(node.content)`
+        """
+        cached = self._files.get(str(node.path))
+        if cached is None or node.children or cached.content != node.content:
+            return utils.get_content_preview(node.content)
+        if cached.content_preview is None:
+            cached.content_preview = utils.get_content_preview(cached.content)
+        return cached.content_preview
+
+    def build_node(
+        self,
+        path: str,
+        node_name: str,
+        is_dir: bool,
+        relative_path: Optional[str] = None,
+        path_filter: Optional[Callable[[str], bool]] = None,
+        revalidate: bool = True,
+        pending: Optional[list[tuple[MemoryNode, str, os.stat_result]]] = None,
+    ) -> Optional[MemoryNode]:
+        """
+        Build the memory node for a file or directory.
+
+        Args:
+            path: Full filesystem path of the entry
+            node_name: Display name of the node
+            is_dir: Whether the entry is a directory
+            relative_path: Path of the entry relative to the memory base directory,
+                defaults to `node_name`
+            path_filter: If given, only files whose relative path matches this
+                filter are read, other file nodes are built without content and tags
+            revalidate: Whether to check cached entries against the filesystem.
+                If False, cached entries are used as-is and only entries that
+                are not cached (e.g. invalidated ones) are scanned.
+            pending: If given, files missing from the cache are not read but
+                appended to this list with their node, see `_read_pending`
+
+        Returns:
+            The memory node, or None for non-memory files and directories
+            without any memory file. Nodes are built from values that are
+            already valid, so they are constructed without validation.
+        """
+        if relative_path is None:
+            relative_path = node_name
+
+        if not is_dir and not _is_memory_file_name(node_name):
+            return None
+
+        cached_file: Optional[_CachedFile] = None
+        entries: Optional[list[tuple[str, bool]]] = None
+        if not revalidate:
+            if is_dir:
+                cached_dir = self._dirs.get(path)
+                entries = cached_dir.entries if cached_dir is not None else None
+            else:
+                cached_file = self._files.get(path)
+
+        if cached_file is None and entries is None:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # Removed while scanning
+                return None
+
+            if is_dir:
+                entries = self._list_dir(path, stat.st_mtime_ns)
+            elif not stat_module.S_ISREG(stat.st_mode):
+                return None
+            elif path_filter is not None and not path_filter(relative_path):
+                # Not needed by the caller, skip reading the file
+                return MemoryNode.model_construct(path=Path(path), name=node_name)
+            elif pending is not None:
+                node = MemoryNode.model_construct(path=Path(path), name=node_name)
+                pending.append((node, path, stat))
+                return node
+            else:
+                cached_file = self._read_file(path, stat)
+
+        if cached_file is not None:
+            # Keep full node name with .md extension for display
+            return MemoryNode.model_construct(
+                path=Path(path),  # Full filesystem path
+                name=node_name,  # Full display name with .md extension
+                content=cached_file.content,
+                tags=cached_file.tags,
+                children=[],
+            )
+
+        # Create directory node with children
+        children = []
+        for child_name, child_is_dir in entries or []:
+            child_node = self.build_node(
+                f"{path}{os.sep}{child_name}",
+                child_name,
+                child_is_dir,
+                f"{relative_path}{os.sep}{child_name}",
+                path_filter,
+                revalidate,
+                pending,
+            )
+            if child_node:
+                children.append(child_node)
+
+        if not children:  # Only create directory nodes if they have children
+            return None
+        return MemoryNode.model_construct(
+            path=Path(path),  # Full filesystem path
+            name=node_name,  # Simple directory name
+            content="",
+            tags=[],
+            children=children,
+        )
+
+    def load(
+        self,
+        base_dir: Path,
+        path_filter: Optional[Callable[[str], bool]] = None,
+        revalidate: bool = True,
+    ) -> Memory:
+        """
+        Load the memory tree under a base directory.
+
+        Args:
+            base_dir: The memory base directory
+            path_filter: Only read files whose relative path matches this filter,
+                see `build_node`
+            revalidate: Whether to check cached entries against the filesystem,
+                see `build_node`
+
+        Returns:
+            The memory tree, with single-child directories collapsed
+        """
+        base_path = str(base_dir)
+        cached_dir = None if revalidate else self._dirs.get(base_path)
+        if cached_dir is not None:
+            entries = cached_dir.entries
+        else:
+            try:
+                entries = self._list_dir(base_path, os.stat(base_path).st_mtime_ns)
+            except FileNotFoundError:
+                return Memory()
+
+        # Build nodes from filesystem, reading the files missing from the cache
+        # afterwards so that they can be read concurrently
+        pending: list[tuple[MemoryNode, str, os.stat_result]] = []
+        nodes = []
+        for name, is_dir in entries:
+            node = self.build_node(
+                f"{base_path}{os.sep}{name}",
+                name,
+                is_dir,
+                name,
+                path_filter,
+                revalidate,
+                pending,
+            )
+            if node:
+                nodes.append(node)
+        self._read_pending(pending)
+
+        # Apply folder collapsing
+        return Memory.model_construct(
+            nodes=[utils.merge_single_child_memory_dirs(n) for n in nodes]
+        )
@@ -2,16 +2,18 @@
 
 # pyre-strict
 
+import asyncio
 from pathlib import Path
 from textwrap import dedent
-from typing import Any, cast, Dict, List, Optional
+from typing import Any, Callable, cast, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .....core import types as cf
 from .....core.analect import AnalectRunContext
 
 from .....core.chat_models.bedrock.api.invoke_model import anthropic as ant
+
 # Custom IO types not available in this version
 
 from .....utils.artifact import set_artifact
@@ -21,6 +23,7 @@ from ...function.utils import Function, get_runnable
 from ..reminder import MemoryReminder
 
 from . import utils
+from .cache import MemoryTreeCache
 from .exceptions import MemoryNodeNotFoundError
 from .prompts import (
     DELETE_MEMORY_DESCRIPTION,
@@ -35,6 +38,16 @@ from .prompts import (
 from .types import Memory, MemoryNode
 
 NUM_LLM_CALLS_KEY = "num_llm_calls"
+# Number of sessions covered by each progress message of import_memory
+IMPORT_PROGRESS_BATCH_SIZE = 5
+
+SEARCH_CRITERIA_MESSAGE: str = dedent("""\
+    Searching memory with the following criteria:
+
+    ```json
+    {data}
+    ```
+    """)
 
 
 class SearchMemoryInput(BaseModel):
@@ -103,6 +116,53 @@ class MemoryOperationResult(BaseModel):
     data: Optional[Dict[str, Any]] = Field(None, description="Optional result data")
 
 
+# The input schemas are static, so the tools are built once rather than on each
+# `tools` access
+_MEMORY_TOOLS: list[ant.ToolLike] = [
+    ant.Tool(
+        name="search_memory",
+        description=SEARCH_MEMORY_DESCRIPTION,
+        input_schema=SearchMemoryInput.model_json_schema(),
+    ),
+    ant.Tool(
+        name="read_memory",
+        description=READ_MEMORY_DESCRIPTION,
+        input_schema=ReadMemoryInput.model_json_schema(),
+    ),
+    ant.Tool(
+        name="write_memory",
+        description=WRITE_MEMORY_DESCRIPTION,
+        input_schema=WriteMemoryInput.model_json_schema(),
+    ),
+    ant.Tool(
+        name="edit_memory",
+        description=EDIT_MEMORY_DESCRIPTION,
+        input_schema=EditMemoryInput.model_json_schema(),
+    ),
+    ant.Tool(
+        name="delete_memory",
+        description=DELETE_MEMORY_DESCRIPTION,
+        input_schema=DeleteMemoryInput.model_json_schema(),
+    ),
+    ant.Tool(
+        name="import_memory",
+        description=IMPORT_MEMORY_DESCRIPTION,
+        input_schema=ImportMemoryInput.model_json_schema(),
+    ),
+]
+
+# Input type and handler method name of each memory tool, handlers are looked up by
+# name so that subclasses can override them
+_TOOL_HANDLERS: dict[str, tuple[type[BaseModel], str]] = {
+    "search_memory": (SearchMemoryInput, "_search_memory"),
+    "read_memory": (ReadMemoryInput, "_read_memory"),
+    "write_memory": (WriteMemoryInput, "_write_memory"),
+    "edit_memory": (EditMemoryInput, "_edit_memory"),
+    "delete_memory": (DeleteMemoryInput, "_delete_memory"),
+    "import_memory": (ImportMemoryInput, "_import_memory"),
+}
+
+
 class HierarchicalMemoryExtension(MemoryReminder):
     """Hierarchical memory extension with file-system based organization."""
 
@@ -122,11 +182,18 @@ class HierarchicalMemoryExtension(MemoryReminder):
     artifact_display_name: str = Field(
         default="Memory", description="Display name for the memory artifact"
     )
+    trace_memory_reads: bool = Field(
+        default=False,
+        description="Whether to trace read_memory and search_memory lookups as tool runs, if not enabled, they are run directly to avoid the per-call overhead",
+    )
     # Configuration fields for local storage
     reminder_message: str = Field(
         default=HIERARCHICAL_MEMORY_REMINDER_MESSAGE,
         description="Message to remind the user to write or edit hierarchical memory",
     )
+    _tree_cache: MemoryTreeCache = PrivateAttr(default_factory=MemoryTreeCache)
+    # Session directories already created by `_get_memory_base_dir`
+    _created_dirs: set[Path] = PrivateAttr(default_factory=set)
 
     async def description(self) -> TagLike:
         return HIERARCHICAL_MEMORY_DESCRIPTION
@@ -135,100 +202,35 @@ class HierarchicalMemoryExtension(MemoryReminder):
     async def tools(self) -> List[ant.ToolLike]:
         if self.enable_tool_use:
             tools = await super().tools
-            return tools + [
-                ant.Tool(
-                    name="search_memory",
-                    description=SEARCH_MEMORY_DESCRIPTION,
-                    input_schema=SearchMemoryInput.model_json_schema(),
-                ),
-                ant.Tool(
-                    name="read_memory",
-                    description=READ_MEMORY_DESCRIPTION,
-                    input_schema=ReadMemoryInput.model_json_schema(),
-                ),
-                ant.Tool(
-                    name="write_memory",
-                    description=WRITE_MEMORY_DESCRIPTION,
-                    input_schema=WriteMemoryInput.model_json_schema(),
-                ),
-                ant.Tool(
-                    name="edit_memory",
-                    description=EDIT_MEMORY_DESCRIPTION,
-                    input_schema=EditMemoryInput.model_json_schema(),
-                ),
-                ant.Tool(
-                    name="delete_memory",
-                    description=DELETE_MEMORY_DESCRIPTION,
-                    input_schema=DeleteMemoryInput.model_json_schema(),
-                ),
-                ant.Tool(
-                    name="import_memory",
-                    description=IMPORT_MEMORY_DESCRIPTION,
-                    input_schema=ImportMemoryInput.model_json_schema(),
-                ),
-            ]
+            return tools + _MEMORY_TOOLS
         return []
 
     def _get_memory_base_dir(self, context: AnalectRunContext) -> Path:
         """Get the base directory for this session's memory."""
         session_id = context.session or "default"
         session_dir = self.directory / f"{self.namespace}_{session_id}"
-        session_dir.mkdir(parents=True, exist_ok=True)
+        if session_dir not in self._created_dirs:
+            session_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(session_dir)
         return session_dir
 
     # Memory synchronization methods not implemented in this version
 
-    async def _load_memory_from_filesystem(self, context: AnalectRunContext) -> Memory:
-        """Load memory structure by scanning the filesystem."""
-
-        base_dir = self._get_memory_base_dir(context)
-        if not base_dir.exists():
-            return Memory()
-
-        def build_node_from_path(path: Path, node_name: str) -> Optional[MemoryNode]:
-            if path.is_file() and path.suffix == ".md":
-                # Read file content and parse frontmatter
-                content = path.read_text()
-                tags, clean_content = utils.parse_frontmatter(content)
-
-                # Keep full node name with .md extension for display
-                display_name = node_name
-                return MemoryNode(
-                    path=path,  # Full filesystem path
-                    name=display_name,  # Full display name with .md extension
-                    content=clean_content,
-                    tags=tags,
-                    children=[],
-                )
-            elif path.is_dir():
-                # Create directory node with children
-                children = []
-                for child_path in sorted(path.iterdir()):
-                    child_node = build_node_from_path(child_path, child_path.name)
-                    if child_node:
-                        children.append(child_node)
-
-                if children:  # Only create directory nodes if they have children
-                    return MemoryNode(
-                        path=path,  # Full filesystem path
-                        name=node_name,  # Simple directory name
-                        content="",
-                        tags=[],
-                        children=children,
-                    )
-
-            return None
+    async def _load_memory_from_filesystem(
+        self, context: AnalectRunContext, revalidate: bool = True
+    ) -> Memory:
+        """Load memory structure by scanning the filesystem.
 
-        # Build nodes from filesystem
-        nodes = []
-        for path in sorted(base_dir.iterdir()):
-            node = build_node_from_path(path, path.name)
-            if node:
-                # Apply folder collapsing
-                merged_node = utils.merge_single_child_memory_dirs(node)
-                nodes.append(merged_node)
+        Args:
+            context: The context of the run
+            revalidate: Whether to check every cached entry against the filesystem.
+                After a mutation made by this extension, the mutated paths are
+                already invalidated, so only they need to be scanned again.
+        """
 
-        return Memory(nodes=nodes)
+        base_dir = self._get_memory_base_dir(context)
+        # Only changed directories are listed and only changed files are re-read
+        return self._tree_cache.load(base_dir, revalidate=revalidate)
 
     def _get_content_file_path(
         self, node_path: str, context: AnalectRunContext
@@ -241,10 +243,20 @@ class HierarchicalMemoryExtension(MemoryReminder):
         """Display the current memory structure as an artifact."""
         self.reset_reminder()
         try:
+            # Same as memory.model_dump_json(), reusing unchanged files
+            value = self._tree_cache.dump_json(memory)
+            artifacts = context.artifacts
+            if (
+                self.artifact_identifier in artifacts
+                and artifacts[self.artifact_identifier].value == value
+            ):
+                # Memory unchanged since it was last displayed
+                return
+
             # Create a simple artifact with memory structure
             attachment = await set_artifact(
                 name=self.artifact_identifier,
-                value=memory.model_dump_json(),  # Simple JSON representation
+                value=value,
                 display_name=self.artifact_display_name,
             )
             await context.io.ai("Memory updated", attachments=[attachment])
@@ -276,24 +288,47 @@ class HierarchicalMemoryExtension(MemoryReminder):
         runnable = get_runnable(func)
         return await context.invoke(runnable, kwargs, run_type="tool")
 
+    async def _run_read_func(
+        self,
+        func: Callable[..., object],
+        context: AnalectRunContext,
+        /,
+        **kwargs: Any,
+    ) -> object:
+        """
+        Run a synchronous read-only function with the given arguments.
+
+        The function is only run through `_run_func` (and thus traced as a tool
+        run) if `trace_memory_reads` is enabled, otherwise it is called directly.
+
+        Args:
+            func (Callable[..., object]): The function to run.
+            context (AnalectRunContext): The context of the run.
+
+        Returns:
+            object: The result of the function.
+        """
+        if self.trace_memory_reads:
+            return await self._run_func(func, context, **kwargs)
+        return func(**kwargs)
+
     async def _search_memory(
         self, inp: SearchMemoryInput, context: AnalectRunContext
     ) -> MemoryOperationResult:
         """Search for memory nodes based on various criteria."""
         await context.io.system(
-            dedent("""\
-            Searching memory with the following criteria:
-
-            ```json
-            {data}
-            ```
-            """).format(data=inp.model_dump_json(indent=2)),
+            SEARCH_CRITERIA_MESSAGE.format(data=inp.model_dump_json(indent=2)),
             run_label="Searching Memory",
             run_status=cf.RunStatus.IN_PROGRESS,
         )
 
-        memory: Memory = await self._load_memory_from_filesystem(context)
         base_dir: Path = self._get_memory_base_dir(context)
+        # Files whose path does not match the path pattern are not read, their
+        # content and tags are not needed. The tree shape is kept as-is since it
+        # determines how single-child directories are collapsed.
+        memory: Memory = self._tree_cache.load(
+            base_dir, path_filter=utils.compile_path_pattern(inp.path_pattern)
+        )
 
         def search_memory(
             path_pattern: Optional[str],
@@ -303,6 +338,8 @@ class HierarchicalMemoryExtension(MemoryReminder):
         ) -> List[Dict[str, Any]]:
             results: List[Dict[str, Any]] = []
 
+            # Skip files that lack a literal required by the content pattern
+            literals = utils.get_content_pattern_literals(content_pattern)
             utils.collect_matching_nodes(
                 memory.nodes,
                 path_pattern,
@@ -311,12 +348,16 @@ class HierarchicalMemoryExtension(MemoryReminder):
                 max_results,
                 results,
                 base_dir,
+                content_prefilter=lambda node: self._tree_cache.may_contain(
+                    node, literals
+                ),
+                content_preview=self._tree_cache.content_preview,
             )
             return results
 
         results = cast(
             list[dict[str, object]],
-            await self._run_func(
+            await self._run_read_func(
                 search_memory,
                 context,
                 path_pattern=inp.path_pattern,
@@ -356,10 +397,11 @@ class HierarchicalMemoryExtension(MemoryReminder):
             # Get the content file path
             content_file = self._get_content_file_path(path, context)
 
-            if not content_file.exists():
+            try:
+                file_content = content_file.read_text()
+            except (FileNotFoundError, NotADirectoryError):
                 raise MemoryNodeNotFoundError(f"Memory node '{path}' not found")
-
-            if content_file.is_dir():
+            except IsADirectoryError:
                 return view_directory(
                     content_file,
                     depth=1,
@@ -368,7 +410,7 @@ class HierarchicalMemoryExtension(MemoryReminder):
 
             # Use view_file_content for line range support
             return view_file_content(
-                content_file.read_text(),
+                file_content,
                 start_line=start_line,
                 end_line=end_line,
                 max_view_lines=None,
@@ -377,7 +419,7 @@ class HierarchicalMemoryExtension(MemoryReminder):
 
         content = cast(
             str,
-            await self._run_func(
+            await self._run_read_func(
                 read_memory,
                 context,
                 path=inp.path,
@@ -419,16 +461,21 @@ class HierarchicalMemoryExtension(MemoryReminder):
             # Check if node exists
             is_update = content_file.exists()
 
-            # Create parent directories if needed
-            content_file.parent.mkdir(parents=True, exist_ok=True)
-
             # Create content with frontmatter
             content_with_frontmatter = utils.create_content_with_frontmatter(
                 content, tags
             )
 
             # Write to file
-            content_file.write_text(content_with_frontmatter)
+            try:
+                content_file.write_text(content_with_frontmatter)
+            except FileNotFoundError:
+                # Create parent directories if needed
+                content_file.parent.mkdir(parents=True, exist_ok=True)
+                content_file.write_text(content_with_frontmatter)
+            self._tree_cache.invalidate(
+                content_file, self._get_memory_base_dir(context)
+            )
 
             action = "Updated" if is_update else "Created"
             return {"action": action.lower(), "path": path}
@@ -451,8 +498,8 @@ class HierarchicalMemoryExtension(MemoryReminder):
         if inp.tags:
             message += f" and tags: {', '.join(inp.tags)}"
 
-        # Display updated memory
-        memory = await self._load_memory_from_filesystem(context)
+        # Display updated memory, only the mutated path is scanned again
+        memory = await self._load_memory_from_filesystem(context, revalidate=False)
 
         await context.io.system(
             message,
@@ -488,16 +535,17 @@ class HierarchicalMemoryExtension(MemoryReminder):
                 # Get the content file path
                 content_file = self._get_content_file_path(path, context)
 
-                if not content_file.exists():
+                # Delete the file
+                try:
+                    content_file.unlink()
+                except (FileNotFoundError, NotADirectoryError):
                     not_found.append(path)
                     continue
 
-                # Delete the file
-                content_file.unlink()
-
                 # Clean up empty parent directories
                 base_dir = self._get_memory_base_dir(context)
                 utils.cleanup_empty_parent_directories(content_file, base_dir)
+                self._tree_cache.invalidate(content_file, base_dir)
 
                 deleted.append(path)
 
@@ -537,7 +585,7 @@ class HierarchicalMemoryExtension(MemoryReminder):
 
         # Update memory display if any nodes were deleted
         if deleted:
-            memory = await self._load_memory_from_filesystem(context)
+            memory = await self._load_memory_from_filesystem(context, revalidate=False)
             await self._display_memory(memory, context)
 
         return MemoryOperationResult(
@@ -608,27 +656,40 @@ class HierarchicalMemoryExtension(MemoryReminder):
 
         async def import_memory(session_uuids: List[str]) -> None:
             # Copy memory from local session directories
-            import shutil
-
             target_dir = self._get_memory_base_dir(context)
 
-            for i, session_uuid in enumerate(session_uuids):
+            num_sessions = len(session_uuids)
+            for start in range(0, num_sessions, IMPORT_PROGRESS_BATCH_SIZE):
+                batch = session_uuids[start : start + IMPORT_PROGRESS_BATCH_SIZE]
+                batch_names = ", ".join(f"'{uuid}'" for uuid in batch)
                 await context.io.system(
-                    f"Copying memory from local session '{session_uuid}' ({i+1}/{len(session_uuids)})",
+                    f"Copying memory from local session(s) {batch_names} ({start + 1}-{start + len(batch)}/{num_sessions})",
                     run_label="Importing Memory",
                     run_status=cf.RunStatus.IN_PROGRESS,
                 )
 
-                # Source directory for the session to import from
-                source_session_dir = self.directory / f"{self.namespace}_{session_uuid}"
+                warnings = []
+                for session_uuid in batch:
+                    # Source directory for the session to import from
+                    source_session_dir = (
+                        self.directory / f"{self.namespace}_{session_uuid}"
+                    )
 
-                if source_session_dir.exists():
-                    # Copy entire source directory contents into target directory
-                    # NOTE: When file name conflicts occur, the latest file will be kept
-                    shutil.copytree(source_session_dir, target_dir, dirs_exist_ok=True)
-                else:
+                    if source_session_dir.exists():
+                        # Copy entire source directory contents into target directory
+                        # NOTE: When file name conflicts occur, the latest file will be kept
+                        await asyncio.to_thread(
+                            utils.copy_memory_tree, source_session_dir, target_dir
+                        )
+                        self._tree_cache.invalidate(target_dir, target_dir)
+                    else:
+                        warnings.append(
+                            f"Warning: No local memory found for session '{session_uuid}' (expected at {source_session_dir})"
+                        )
+
+                if warnings:
                     await context.io.system(
-                        f"Warning: No local memory found for session '{session_uuid}' (expected at {source_session_dir})",
+                        "\n".join(warnings),
                         run_label="Importing Memory",
                         run_status=cf.RunStatus.IN_PROGRESS,
                     )
@@ -696,16 +757,21 @@ class HierarchicalMemoryExtension(MemoryReminder):
         ) -> None:
             content_file = self._get_content_file_path(path, context)
 
-            if not content_file.exists():
+            try:
+                # Patch the file in place when that is equivalent to replace_in_file
+                if not utils.replace_unique_in_file(content_file, old_str, new_str):
+                    replace_in_file(
+                        path=content_file,
+                        find_text=old_str,
+                        replace_text=new_str,
+                        require_line_num=False,
+                    )
+            except (FileNotFoundError, NotADirectoryError):
                 raise MemoryNodeNotFoundError(
                     f"Memory node '{path}' not found, cannot edit."
                 )
-
-            replace_in_file(
-                path=content_file,
-                find_text=old_str,
-                replace_text=new_str,
-                require_line_num=False,
+            self._tree_cache.invalidate(
+                content_file, self._get_memory_base_dir(context)
             )
 
         await self._run_func(
@@ -725,8 +791,8 @@ class HierarchicalMemoryExtension(MemoryReminder):
             run_status=cf.RunStatus.COMPLETED,
         )
 
-        # Display updated memory
-        memory = await self._load_memory_from_filesystem(context)
+        # Display updated memory, only the mutated path is scanned again
+        memory = await self._load_memory_from_filesystem(context, revalidate=False)
         await self._display_memory(memory, context)
 
         return MemoryOperationResult(
@@ -739,34 +805,15 @@ class HierarchicalMemoryExtension(MemoryReminder):
     ) -> ant.MessageContentToolResult:
         """Handle tool usage."""
         try:
-            if tool_use.name == "search_memory":
-                inp = SearchMemoryInput.model_validate(tool_use.input)
-                result = await self._search_memory(inp, context)
-
-            elif tool_use.name == "read_memory":
-                inp = ReadMemoryInput.model_validate(tool_use.input)
-                result = await self._read_memory(inp, context)
-
-            elif tool_use.name == "write_memory":
-                inp = WriteMemoryInput.model_validate(tool_use.input)
-                result = await self._write_memory(inp, context)
-
-            elif tool_use.name == "edit_memory":
-                inp = EditMemoryInput.model_validate(tool_use.input)
-                result = await self._edit_memory(inp, context)
-
-            elif tool_use.name == "delete_memory":
-                inp = DeleteMemoryInput.model_validate(tool_use.input)
-                result = await self._delete_memory(inp, context)
-
-            elif tool_use.name == "import_memory":
-                inp = ImportMemoryInput.model_validate(tool_use.input)
-                result = await self._import_memory(inp, context)
-
-            else:
+            handler = _TOOL_HANDLERS.get(tool_use.name)
+            if handler is None:
                 # Delegate to parent class for unknown tools (e.g., snooze_reminder)
                 return await super().on_tool_use(tool_use, context)
 
+            input_type, method_name = handler
+            inp = input_type.model_validate(tool_use.input)
+            result = await getattr(self, method_name)(inp, context)
+
             return ant.MessageContentToolResult(
                 tool_use_id=tool_use.id,
                 content=result.model_dump_json(),
@@ -2,38 +2,144 @@
 
 # pyre-strict
 
+import codecs
 import fnmatch
+import locale
+import mmap
+import os
 import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import yaml
 
 from .types import MemoryNode
 
+# libyaml based loader, if PyYAML was built with it
+_FAST_YAML_LOADER: type[yaml.SafeLoader] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Tags that YAML loads as plain strings, see `_parse_simple_tags`
+_SIMPLE_TAG_PATTERN: re.Pattern[str] = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+# Words that YAML resolves to booleans or null instead of strings
+_YAML_RESERVED_WORDS: frozenset[str] = frozenset(
+    ("yes", "no", "true", "false", "on", "off", "null")
+)
+
+_GLOB_WILDCARD_PATTERN: re.Pattern[str] = re.compile(r"[*?[]")
+
+_REGEX_QUANTIFIER_PATTERN: re.Pattern[str] = re.compile(r"\{\d*(?:,\d*)?\}")
+# Escapes whose following characters are part of the escape (hex, unicode, named,
+# octal and group reference escapes), any other escape is a single character
+_REGEX_ESCAPE_PATTERN: re.Pattern[str] = re.compile(
+    r"\\(?:x[0-9A-Fa-f]{0,2}|u[0-9A-Fa-f]{0,4}|U[0-9A-Fa-f]{0,8}|N\{[^}]*\}?|\d+|.)",
+    re.DOTALL,
+)
+
+# Characters other than "\n" for which `str.isspace()` is true
+_NON_NEWLINE_WHITESPACE = (
+    "\t\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004"
+    "\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+# Matches UTF-8 lines made only of whitespace, which `replace_in_file` blanks
+_WHITESPACE_ONLY_LINE_PATTERN: re.Pattern[bytes] = re.compile(
+    b"^(?:"
+    + b"|".join(re.escape(char.encode()) for char in _NON_NEWLINE_WHITESPACE)
+    + b")+$",
+    re.MULTILINE,
+)
+
+
+def _parse_simple_tags(frontmatter_str: str) -> Optional[List[str]]:
+    """Parse a frontmatter block made only of a block list of plain word tags.
+
+    This is the shape written by `create_content_with_frontmatter` for usual
+    tags. Returns None for any other frontmatter, which must be loaded as YAML.
+    """
+    lines = frontmatter_str.split("\n")
+    if lines[0] != "tags:" or lines[-1] != "" or len(lines) < 3:
+        return None
+
+    tags = []
+    for line in lines[1:-1]:
+        if not line.startswith("- "):
+            return None
+        tag = line[2:]
+        if (
+            _SIMPLE_TAG_PATTERN.fullmatch(tag) is None
+            or tag.lower() in _YAML_RESERVED_WORDS
+        ):
+            return None
+        tags.append(tag)
+    return tags
+
+
+def _load_frontmatter_tags(frontmatter_str: str) -> Optional[List[str]]:
+    """Load the tags list from a YAML frontmatter block, None if it has none."""
+    tags = _parse_simple_tags(frontmatter_str)
+    if tags is not None:
+        return tags
+
+    # The libyaml loader is much faster, but unlike the Python loader it accepts
+    # tabs and byte order marks in some places, so it is only used without them
+    loader = (
+        _FAST_YAML_LOADER
+        if frontmatter_str.isascii() and "\t" not in frontmatter_str
+        else yaml.SafeLoader
+    )
+    try:
+        frontmatter = yaml.load(frontmatter_str, Loader=loader)
+        if isinstance(frontmatter, dict) and "tags" in frontmatter:
+            tags = frontmatter["tags"]
+            if isinstance(tags, list):
+                return tags
+    except Exception:
+        pass
+
+    return None
+
 
 def parse_frontmatter(content: str) -> tuple[List[str], str]:
     """Parse YAML frontmatter from markdown content."""
-    if not content.startswith("---\n"):
+    # Locate the frontmatter instead of splitting, so that the body is only
+    # copied once
+    parsed = parse_frontmatter_head(content)
+    if parsed is None:
         return [], content
 
-    try:
-        parts = content.split("---\n", 2)
-        if len(parts) < 3:
-            return [], content
+    tags, offset = parsed
+    return tags, content[offset:]
 
-        frontmatter_str = parts[1]
-        actual_content = parts[2]
 
-        frontmatter = yaml.safe_load(frontmatter_str)
-        if isinstance(frontmatter, dict) and "tags" in frontmatter:
-            tags = frontmatter["tags"]
-            if isinstance(tags, list):
-                return tags, actual_content
-    except Exception:
-        pass
+def parse_frontmatter_head(head: str) -> Optional[tuple[List[str], int]]:
+    """Parse YAML frontmatter from the beginning of markdown content.
 
-    return [], content
+    Args:
+        head: The first characters of the content
+
+    Returns:
+        The tags and the offset at which the actual content starts, or None if
+        the frontmatter does not end within `head`
+    """
+    if not head.startswith("---\n"):
+        return [], 0
+
+    end = head.find("---\n", 4)
+    if end < 0:
+        return None
+
+    tags = _load_frontmatter_tags(head[4:end])
+    if tags is None:
+        return [], 0
+    return tags, end + 4
+
+
+@lru_cache(maxsize=256)
+def _dump_tags_frontmatter(tags: tuple[str, ...]) -> str:
+    # Memory files often share the same tags, and dumping YAML is slow
+    frontmatter = {"tags": list(tags)}
+    return yaml.dump(frontmatter, default_flow_style=False)
 
 
 def create_content_with_frontmatter(content: str, tags: List[str]) -> str:
@@ -41,9 +147,7 @@ def create_content_with_frontmatter(content: str, tags: List[str]) -> str:
     if not tags:
         return content
 
-    frontmatter = {"tags": tags}
-    yaml_str = yaml.dump(frontmatter, default_flow_style=False)
-    return f"---\n{yaml_str}---\n{content}"
+    return f"---\n{_dump_tags_frontmatter(tuple(tags))}---\n{content}"
 
 
 def should_merge_memory_dir(node: MemoryNode) -> bool:
@@ -57,27 +161,92 @@ def should_merge_memory_dir(node: MemoryNode) -> bool:
 
 
 def merge_single_child_memory_dirs(node: MemoryNode) -> MemoryNode:
-    """Merge directories that have only one child directory."""
-    # First, merge children recursively
-    merged_children = [merge_single_child_memory_dirs(child) for child in node.children]
-    node.children = merged_children
-
-    # Then check if this node should be merged with its single child
-    if should_merge_memory_dir(node):
-        child = node.children[0]
-        # Combine the names with a separator for display
-        merged_name = f"{node.name}/{child.name}"
-        return MemoryNode(
-            path=child.path,  # Use child's full path
-            name=merged_name,  # Combined display name
-            content=child.content,
-            tags=child.tags,
-            children=child.children,
-        )
+    """Merge directories that have only one child directory.
+
+    The tree is collapsed in place, each chain of single-child directories being
+    merged into its topmost node, so no new nodes are created.
+    """
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        # Merging a directory with its child gives a node that may be merged again
+        while should_merge_memory_dir(current):
+            child = current.children[0]
+            # Combine the names with a separator for display
+            current.name = f"{current.name}/{child.name}"
+            current.path = child.path  # Use child's full path
+            current.content = child.content
+            current.tags = child.tags
+            current.children = child.children
+        stack.extend(child for child in current.children if child.children)
 
     return node
 
 
+def _compile_glob(pattern: str) -> Callable[[str], bool]:
+    """Compile a glob pattern, same as matching with `fnmatch.fnmatch`."""
+    if _GLOB_WILDCARD_PATTERN.search(pattern) is None:
+        # Literal pattern, e.g. an exact path, which matches only itself
+        literal = os.path.normcase(pattern)
+        return lambda name: os.path.normcase(name) == literal
+
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    return lambda name: match(os.path.normcase(name)) is not None
+
+
+def compile_path_pattern(pattern: Optional[str]) -> Callable[[str], bool]:
+    """Compile a path pattern into a predicate on relative paths of memory nodes.
+
+    Same as `matches_path_pattern`, '.md' extensions are removed before matching.
+    """
+    if pattern is None:
+        return lambda relative_path: True
+
+    matches_glob = _compile_glob(pattern)
+
+    def matches(relative_path: str) -> bool:
+        if relative_path.endswith(".md"):
+            relative_path = relative_path[:-3]
+        return matches_glob(relative_path)
+
+    return matches
+
+
+def _glob_literal_prefix(pattern: str) -> str:
+    """Get the part of a glob pattern before its first wildcard."""
+    wildcard = _GLOB_WILDCARD_PATTERN.search(pattern)
+    return os.path.normcase(
+        pattern if wildcard is None else pattern[: wildcard.start()]
+    )
+
+
+def _may_have_prefix(dir_relative_path: str, prefix: str) -> bool:
+    """Check if paths under a directory can start with a (normcased) prefix."""
+    dir_prefix = os.path.normcase(dir_relative_path) + os.sep
+    return dir_prefix.startswith(prefix) or prefix.startswith(dir_prefix)
+
+
+def _relative_path_str(node: MemoryNode, base_dir: Path) -> Optional[str]:
+    """Get node's path relative to the memory base directory, None if outside of it."""
+    try:
+        return str(node.path.relative_to(base_dir))
+    except ValueError:
+        return None
+
+
+def _matches_relative_path(
+    node: MemoryNode, relative_path: Optional[str], matches_glob: Callable[[str], bool]
+) -> bool:
+    if relative_path is None:
+        # If node.path is not relative to base_dir, fall back to name matching
+        return matches_glob(node.name)
+
+    # For .md files, remove the extension for pattern matching
+    if relative_path.endswith(".md"):
+        relative_path = relative_path[:-3]
+    return matches_glob(relative_path)
+
+
 def matches_path_pattern(
     node: MemoryNode, pattern: Optional[str], base_dir: Path
 ) -> bool:
@@ -85,37 +254,140 @@ def matches_path_pattern(
     if pattern is None:
         return True
 
-    # Compute relative path from memory base directory
-    try:
-        relative_path = node.path.relative_to(base_dir)
-        # For .md files, remove the extension for pattern matching
-        relative_path_str = str(relative_path)
-        if relative_path_str.endswith(".md"):
-            relative_path_str = relative_path_str[:-3]
-        return fnmatch.fnmatch(relative_path_str, pattern)
-    except ValueError:
-        # If node.path is not relative to base_dir, fall back to name matching
-        return fnmatch.fnmatch(node.name, pattern)
+    return _matches_relative_path(
+        node, _relative_path_str(node, base_dir), _compile_glob(pattern)
+    )
 
 
-def matches_content_pattern(node: MemoryNode, pattern: Optional[str]) -> bool:
-    """Check if node content matches the given pattern."""
+def compile_content_pattern(pattern: Optional[str]) -> Callable[[str], bool]:
+    """Compile a content pattern into a predicate on node content.
+
+    The pattern is matched as a case-insensitive regex, or as a case-insensitive
+    substring if it is not a valid regex.
+    """
     if pattern is None:
-        return True
+        return lambda content: True
 
     try:
-        return bool(re.search(pattern, node.content, re.IGNORECASE))
+        regex = re.compile(pattern, re.IGNORECASE)
     except re.error:
         # If regex is invalid, do simple substring search
-        return pattern.lower() in node.content.lower()
+        lowered_pattern = pattern.lower()
+        return lambda content: lowered_pattern in content.lower()
+    return lambda content: regex.search(content) is not None
 
 
-def matches_tags(node: MemoryNode, required_tags: Optional[List[str]]) -> bool:
-    """Check if node has all required tags."""
+def _extract_regex_literals(pattern: str) -> List[str]:
+    """Extract ASCII literals that any match of a regex must contain.
+
+    This is conservative: anything that is not obviously a required literal
+    character (escapes, classes, groups, quantified characters) ends a literal.
+    """
+    if "|" in pattern or "(?" in pattern:
+        # Alternations and extensions (e.g. verbose mode) are not analyzed
+        return []
+
+    literals: List[str] = []
+    literal: List[str] = []
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        i += 1
+        quantifier = _REGEX_QUANTIFIER_PATTERN.match(pattern, i - 1)
+        if char in "?*" or (char == "{" and quantifier):
+            # The preceding character is optional or repeated an unknown number of times
+            if literal:
+                literal.pop()
+            if quantifier:
+                i = quantifier.end()
+        elif char == "\\":
+            escape = _REGEX_ESCAPE_PATTERN.match(pattern, i - 1)
+            i = escape.end() if escape else len(pattern)
+        elif char == "[":
+            # Skip the character class, a leading ']' is part of it
+            if pattern[i : i + 1] == "^":
+                i += 1
+            if pattern[i : i + 1] == "]":
+                i += 1
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and char.isascii() and char not in ".^$+{":
+            literal.append(char)
+            continue
+
+        # Anything but a plain literal character ends the current literal
+        if literal:
+            literals.append("".join(literal))
+            literal = []
+
+    if literal:
+        literals.append("".join(literal))
+    return literals
+
+
+def get_content_pattern_literals(pattern: Optional[str]) -> List[str]:
+    """Get lowercased literals that content matching a content pattern must contain.
+
+    Case-insensitive regex matching is not the same as comparing lowercased
+    text for some non-ASCII characters, so the literals only apply to ASCII
+    content, see `MemoryTreeCache.may_contain`.
+
+    Args:
+        pattern: Content pattern, see `compile_content_pattern`
+
+    Returns:
+        The literals, empty if no literal is known to be required
+    """
+    if pattern is None:
+        return []
+
+    try:
+        re.compile(pattern, re.IGNORECASE)
+        literals = _extract_regex_literals(pattern)
+    except re.error:
+        # Invalid regexes are searched as substrings
+        literals = [pattern]
+
+    return [literal.lower() for literal in literals]
+
+
+def matches_content_pattern(node: MemoryNode, pattern: Optional[str]) -> bool:
+    """Check if node content matches the given pattern."""
+    return compile_content_pattern(pattern)(node.content)
+
+
+def compile_required_tags(
+    required_tags: Optional[List[str]],
+) -> Callable[[List[str]], bool]:
+    """Compile required tags into a predicate on node tags.
+
+    The predicate checks that the node has all required tags, using set
+    containment rather than scanning the node tags once per required tag.
+    """
     if not required_tags:
-        return True
+        return lambda node_tags: True
+
+    required = frozenset(required_tags)
+
+    def matches(node_tags: List[str]) -> bool:
+        try:
+            return required.issubset(node_tags)
+        except TypeError:
+            # Unhashable values loaded from a hand-written frontmatter
+            return all(tag in node_tags for tag in required_tags)
+
+    return matches
 
-    return all(tag in node.tags for tag in required_tags)
+
+def matches_tags(node: MemoryNode, required_tags: Optional[List[str]]) -> bool:
+    """Check if node has all required tags."""
+    return compile_required_tags(required_tags)(node.tags)
 
 
 def node_matches_criteria(
@@ -128,26 +400,19 @@ def node_matches_criteria(
     """Check if a node matches all search criteria."""
     return (
         matches_path_pattern(node, path_pattern, base_dir)
-        and matches_content_pattern(node, content_pattern)
         and matches_tags(node, tags)
+        and matches_content_pattern(node, content_pattern)
     )
 
 
-def create_search_result(node: MemoryNode, base_dir: Path) -> Dict[str, Any]:
-    """Create a search result dictionary from a node."""
-    content_preview = (
-        node.content[:100] + "..." if len(node.content) > 100 else node.content
-    )
+def get_content_preview(content: str) -> str:
+    """Get the preview of node content shown in search results."""
+    return content[:100] + "..." if len(content) > 100 else content
 
-    # Use relative path from memory base directory for search results
-    try:
-        relative_path = node.path.relative_to(base_dir)
-        file_path = str(relative_path)
-        # Keep .md extension for display
-    except ValueError:
-        # Fallback to node name if relative path calculation fails
-        file_path = node.name
 
+def _create_search_result(
+    node: MemoryNode, file_path: str, content_preview: str
+) -> Dict[str, Any]:
     return {
         "path": file_path,
         "tags": node.tags,
@@ -155,6 +420,19 @@ def create_search_result(node: MemoryNode, base_dir: Path) -> Dict[str, Any]:
     }
 
 
+def create_search_result(node: MemoryNode, base_dir: Path) -> Dict[str, Any]:
+    """Create a search result dictionary from a node."""
+    # Use relative path from memory base directory for search results, keeping
+    # the .md extension for display, and fall back to node name if relative path
+    # calculation fails
+    file_path = _relative_path_str(node, base_dir)
+    return _create_search_result(
+        node,
+        node.name if file_path is None else file_path,
+        get_content_preview(node.content),
+    )
+
+
 def collect_matching_nodes(
     nodes: List[MemoryNode],
     path_pattern: Optional[str],
@@ -163,26 +441,75 @@ def collect_matching_nodes(
     max_results: int,
     results: List[Dict[str, Any]],
     base_dir: Path,
+    content_prefilter: Optional[Callable[[MemoryNode], bool]] = None,
+    content_preview: Optional[Callable[[MemoryNode], str]] = None,
 ) -> None:
-    """Recursively collect nodes that match search criteria."""
-    for node in nodes:
-        if len(results) >= max_results:
-            return
-
-        if node_matches_criteria(node, path_pattern, content_pattern, tags, base_dir):
-            results.append(create_search_result(node, base_dir))
-
-        if node.children:
-            collect_matching_nodes(
-                node.children,
-                path_pattern,
-                content_pattern,
-                tags,
-                max_results,
-                results,
-                base_dir,
+    """Collect nodes that match search criteria, in depth-first pre-order.
+
+    `content_prefilter`, if given, is checked before the content pattern and
+    may only return False for nodes whose content cannot match it.
+    `content_preview`, if given, replaces `get_content_preview` for the content
+    previews of the results.
+    """
+    # Compile the patterns once for the whole tree
+    matches_glob = None if path_pattern is None else _compile_glob(path_pattern)
+    # Every path matching the path pattern starts with its literal prefix, so
+    # directories whose subtree cannot start with it are not descended into
+    literal_prefix = (
+        None if path_pattern is None else _glob_literal_prefix(path_pattern)
+    )
+    matches_content = compile_content_pattern(content_pattern)
+    matches_required_tags = compile_required_tags(tags)
+
+    # Iterative pre-order traversal, children are pushed in reverse so that
+    # they are visited in order
+    stack = list(reversed(nodes))
+    while stack and len(results) < max_results:
+        node = stack.pop()
+        # Relative path is computed at most once per node, and shared by path
+        # matching and the search result
+        relative_path = None
+        if matches_glob is not None:
+            relative_path = _relative_path_str(node, base_dir)
+            matched = _matches_relative_path(node, relative_path, matches_glob)
+        else:
+            matched = True
+        if (
+            matched
+            # Cheapest checks first, the content pattern can scan large contents
+            and matches_required_tags(node.tags)
+            and (content_prefilter is None or content_prefilter(node))
+            and matches_content(node.content)
+        ):
+            if matches_glob is None:
+                relative_path = _relative_path_str(node, base_dir)
+            results.append(
+                _create_search_result(
+                    node,
+                    node.name if relative_path is None else relative_path,
+                    (
+                        get_content_preview(node.content)
+                        if content_preview is None
+                        else content_preview(node)
+                    ),
+                )
             )
 
+        if node.children and (
+            literal_prefix is None
+            or relative_path is None
+            or _may_have_prefix(relative_path, literal_prefix)
+        ):
+            stack.extend(reversed(node.children))
+
+
+def _is_empty_dir(path: Path) -> bool:
+    # Stop at the first entry, without building a Path for it
+    with os.scandir(path) as it:
+        for _ in it:
+            return False
+    return True
+
 
 def cleanup_empty_parent_directories(file_path: Path, base_dir: Path) -> None:
     """Clean up empty parent directories after file deletion.
@@ -193,10 +520,11 @@ def cleanup_empty_parent_directories(file_path: Path, base_dir: Path) -> None:
     """
     parent_dir = file_path.parent
 
-    # Remove empty parent directories up to base_dir
-    while parent_dir != base_dir and parent_dir.exists():
+    # Remove empty parent directories up to base_dir, a missing directory stops
+    # the cleanup like any other OSError
+    while parent_dir != base_dir:
         try:
-            if not any(parent_dir.iterdir()):  # Directory is empty
+            if _is_empty_dir(parent_dir):
                 parent_dir.rmdir()
                 parent_dir = parent_dir.parent
             else:
@@ -205,5 +533,104 @@ def cleanup_empty_parent_directories(file_path: Path, base_dir: Path) -> None:
             break  # Error occurred, stop cleanup
 
 
+def copy_memory_tree(src: Path, dst: Path, max_workers: int = 8) -> None:
+    """Copy a memory directory tree into a directory, overwriting existing files.
+
+    Same as `shutil.copytree(src, dst, dirs_exist_ok=True)`, except that the
+    files are copied concurrently.
+
+    Args:
+        src: Source directory
+        dst: Destination directory, created if it does not exist
+        max_workers: Maximum number of files copied at the same time
+    """
+    files: List[tuple[Path, Path]] = []
+    dirs: List[tuple[Path, Path]] = []
+
+    def collect(src_dir: Path, dst_dir: Path) -> None:
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                if entry.is_dir():
+                    collect(src_dir / entry.name, dst_dir / entry.name)
+                else:
+                    files.append((src_dir / entry.name, dst_dir / entry.name))
+        dirs.append((src_dir, dst_dir))
+
+    collect(src, dst)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(shutil.copy2, s, d) for s, d in files]
+        for future in futures:
+            future.result()
+
+    # Copy directory metadata last, as copying the files updates the mtimes
+    for src_dir, dst_dir in dirs:
+        shutil.copystat(src_dir, dst_dir)
+
+
+def replace_unique_in_file(path: Path, find_text: str, replace_text: str) -> bool:
+    """Replace the only occurrence of a text in a file, rewriting it from the match on.
+
+    This is a fast path for
+    `replace_in_file(path, find_text, replace_text, require_line_num=False)`, taken
+    only when both give the same result: a UTF-8 file without '\\r' or
+    whitespace-only lines, containing exactly one occurrence of `find_text`.
+    Replacements of the same length are patched in place.
+
+    Args:
+        path: Path of the file to edit
+        find_text: Exact text to find
+        replace_text: Replacement text
+
+    Returns:
+        Whether the text was replaced, the file is left untouched otherwise
+    """
+    if (
+        os.linesep != "\n"
+        or codecs.lookup(locale.getpreferredencoding(False)).name != "utf-8"
+    ):
+        return False
+
+    try:
+        find_bytes = find_text.encode()
+        replace_bytes = replace_text.encode()
+    except UnicodeEncodeError:
+        return False
+    if not find_bytes or _WHITESPACE_ONLY_LINE_PATTERN.search(find_bytes):
+        return False
+
+    with open(path, "r+b") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0)
+        except ValueError:
+            # Empty file
+            return False
+
+        with mm:
+            if mm.find(b"\r") >= 0 or _WHITESPACE_ONLY_LINE_PATTERN.search(mm):
+                return False
+            try:
+                # replace_in_file fails on files that are not valid UTF-8
+                str(mm, "utf-8")
+            except UnicodeDecodeError:
+                return False
+            start = mm.find(find_bytes)
+            if start < 0 or mm.find(find_bytes, start + 1) >= 0:
+                return False
+
+            end = start + len(find_bytes)
+            if len(replace_bytes) == len(find_bytes):
+                mm[start:end] = replace_bytes
+                mm.flush()
+                return True
+            tail = mm[end:]
+
+        f.seek(start)
+        f.write(replace_bytes + tail)
+        f.truncate()
+    return True
+
+
 # Cloud storage functions not implemented in this version
 # Memory operations use local filesystem only
@@ -2,10 +2,11 @@
 
 # pyre-strict
 
-from typing import cast, List
+from dataclasses import dataclass
+from typing import cast, List, Optional
 
 from langchain_core.messages import BaseMessage, HumanMessage
-from pydantic import BaseModel, Field, model_validator
+from pydantic import Field, model_validator, PrivateAttr
 
 from ....core.analect import AnalectRunContext, get_current_context
 
@@ -28,16 +29,22 @@ You can use the "snooze_reminder" tool to snooze the reminder temporarily.
 </note>
 """
 
+# Built once rather than on each `tools` access
+_SNOOZE_REMINDER_TOOL: ant.Tool = ant.Tool(
+    name="snooze_reminder",
+    description="Snooze the memory reminder temporarily. This tool requires no arguments.",
+    input_schema={"type": "object", "properties": {}, "required": []},
+)
 
-class _LLMCallCounter(BaseModel):
-    num_llm_calls: int = Field(
-        default=0,
-        description="Number of LLM calls since the beginning of the session or since the last reset",
-    )
-    total_num_llm_calls: int = Field(
-        default=0,
-        description="Total number of LLM calls since the beginning of the session",
-    )
+
+@dataclass(slots=True)
+class _LLMCallCounter:
+    """Counters updated on every LLM call, a slotted dataclass to keep updates cheap."""
+
+    # Number of LLM calls since the beginning of the session or since the last reset
+    num_llm_calls: int = 0
+    # Total number of LLM calls since the beginning of the session
+    total_num_llm_calls: int = 0
 
 
 class MemoryReminder(ToolUseExtension):
@@ -54,6 +61,9 @@ class MemoryReminder(ToolUseExtension):
         description="Number of LLM calls to reduce when snoozing the reminder",
     )
 
+    # (reminder_message, full reminder text) for the last reminder message used
+    _reminder_text: Optional[tuple[str, str]] = PrivateAttr(default=None)
+
     @model_validator(mode="after")
     def validate_snooze_amount(self) -> "MemoryReminder":  # noqa
         """Validate that snooze_amount is not greater than max_llm_calls_before_reminder."""
@@ -70,26 +80,35 @@ class MemoryReminder(ToolUseExtension):
         Counters for LLM calls in the current session
         """
         context = get_current_context()
-        return cast(
-            _LLMCallCounter,
-            context.session_storage[self.__class__.__name__].setdefault(
-                LLM_CALL_COUNTER_KEY, _LLMCallCounter()
-            ),
-        )
+        storage = context.session_storage[self.__class__.__name__]
+        counter = storage.get(LLM_CALL_COUNTER_KEY)
+        if counter is None:
+            # Only build a counter when the session has none, unlike `setdefault`
+            counter = storage[LLM_CALL_COUNTER_KEY] = _LLMCallCounter()
+        return cast(_LLMCallCounter, counter)
+
+    def _get_reminder_text(self) -> str:
+        """Get the reminder message with the snooze note, built once per message."""
+        cached = self._reminder_text
+        if cached is None or cached[0] is not self.reminder_message:
+            message = self.reminder_message
+            cached = (message, message + SNOOZE_NOTE_MESSAGE)
+            self._reminder_text = cached
+        return cached[1]
 
     async def on_invoke_llm(
         self,
         messages: list[BaseMessage],
         context: AnalectRunContext,
     ) -> list[BaseMessage]:
-        self._llm_call_counter.num_llm_calls += 1
-        self._llm_call_counter.total_num_llm_calls += 1
+        counter = self._llm_call_counter
+        counter.num_llm_calls += 1
+        counter.total_num_llm_calls += 1
         messages = await super().on_invoke_llm(messages, context)
 
-        if self._llm_call_counter.num_llm_calls >= self.max_llm_calls_before_reminder:
-            reminder_message = self.reminder_message + SNOOZE_NOTE_MESSAGE
-
-            messages.append(HumanMessage(content=reminder_message))
+        if counter.num_llm_calls >= self.max_llm_calls_before_reminder:
+            # A new message each time, since messages may be modified downstream
+            messages.append(HumanMessage(content=self._get_reminder_text()))
 
         return messages
 
@@ -100,13 +119,7 @@ class MemoryReminder(ToolUseExtension):
     async def tools(self) -> List[ant.ToolLike]:
         """Return the snooze_reminder tool if tool use is enabled."""
         if self.enable_tool_use:
-            return [
-                ant.Tool(
-                    name="snooze_reminder",
-                    description="Snooze the memory reminder temporarily. This tool requires no arguments.",
-                    input_schema={"type": "object", "properties": {}, "required": []},
-                )
-            ]
+            return [_SNOOZE_REMINDER_TOOL]
         return []
 
     async def on_tool_use(
@@ -115,9 +128,8 @@ class MemoryReminder(ToolUseExtension):
         """Handle the snooze_reminder tool."""
         if tool_use.name == "snooze_reminder":
             # Decrease num_llm_calls by snooze_amount, but don't go below 0
-            current_count = self._llm_call_counter.num_llm_calls
-            new_count = max(0, current_count - self.snooze_amount)
-            self._llm_call_counter.num_llm_calls = new_count
+            counter = self._llm_call_counter
+            counter.num_llm_calls = max(0, counter.num_llm_calls - self.snooze_amount)
 
             await context.io.ai("", warning_message="Memory reminder snoozed")
 
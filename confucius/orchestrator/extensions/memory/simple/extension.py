@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Optional
 
 from IPython.display import Markdown
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from .....core import types as cf
 from .....core.analect import AnalectRunContext
@@ -27,8 +27,8 @@ from .prompts import (
 
 
 class ReadMemoryInput(BaseModel):
-    # No parameters needed for read
-    pass
+    start_line: Optional[int] = Field(None, description="Start line for partial read")
+    end_line: Optional[int] = Field(None, description="End line for partial read")
 
 
 class WriteMemoryInput(BaseModel):
@@ -46,6 +46,27 @@ class MemoryOutput(BaseModel):
     file_path: str = Field(..., description="Path to the memory file")
 
 
+# The input schemas are static, so the tools are built once rather than on each
+# `tools` access
+_MEMORY_TOOLS: list[ant.ToolLike] = [
+    ant.Tool(
+        name="read_memory",
+        description=READ_MEMORY_DESCRIPTION,
+        input_schema=ReadMemoryInput.model_json_schema(),
+    ),
+    ant.Tool(
+        name="write_memory",
+        description=WRITE_MEMORY_DESCRIPTION,
+        input_schema=WriteMemoryInput.model_json_schema(),
+    ),
+    ant.Tool(
+        name="edit_memory",
+        description=EDIT_MEMORY_DESCRIPTION,
+        input_schema=EditMemoryInput.model_json_schema(),
+    ),
+]
+
+
 class SimpleMemoryExtension(MemoryReminder):
     """Simple memory extension that provides persistent text storage."""
 
@@ -61,6 +82,12 @@ class SimpleMemoryExtension(MemoryReminder):
         default="memory", description="Identifier for the memory file"
     )
 
+    # Memory file contents by path, valid while the file's (st_mtime_ns, st_size)
+    # is unchanged
+    _file_cache: dict[Path, tuple[tuple[int, int], str]] = PrivateAttr(
+        default_factory=dict
+    )
+
     async def description(self) -> TagLike:
         """
         Return a extension description, which will be inserted into the orchestrator system prompt.
@@ -74,37 +101,49 @@ class SimpleMemoryExtension(MemoryReminder):
         session_id = context.session or "default"
         return memory_dir / f"{self.memory_namespace}_{session_id}.txt"
 
+    def _read_memory_file(self, file_path: Path) -> Optional[str]:
+        """Read the memory file, reusing its cached content while it is unchanged.
+
+        Returns:
+            The content of the memory file, or None if it does not exist
+        """
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            self._file_cache.pop(file_path, None)
+            return None
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_cache.get(file_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        content = file_path.read_text()
+        self._file_cache[file_path] = (stamp, content)
+        return content
+
     @property
     async def tools(self) -> list[ant.ToolLike]:
         if self.enable_tool_use:
             tools = await super().tools
-            return tools + [
-                ant.Tool(
-                    name="read_memory",
-                    description=READ_MEMORY_DESCRIPTION,
-                    input_schema=ReadMemoryInput.model_json_schema(),
-                ),
-                ant.Tool(
-                    name="write_memory",
-                    description=WRITE_MEMORY_DESCRIPTION,
-                    input_schema=WriteMemoryInput.model_json_schema(),
-                ),
-                ant.Tool(
-                    name="edit_memory",
-                    description=EDIT_MEMORY_DESCRIPTION,
-                    input_schema=EditMemoryInput.model_json_schema(),
-                ),
-            ]
+            return tools + _MEMORY_TOOLS
         return []
 
     async def _display_memory(self, context: AnalectRunContext) -> None:
         """Display the current contents of memory."""
         self.reset_reminder()
         file_path = self._get_memory_file_path(context)
-        if not file_path.exists():
+        raw_content = self._read_memory_file(file_path)
+        if raw_content is None:
             return
 
-        raw_content = file_path.read_text()
+        artifacts = context.artifacts
+        if self.memory_identifier in artifacts:
+            displayed = artifacts[self.memory_identifier].value
+            if isinstance(displayed, Markdown) and displayed.data == raw_content:
+                # Memory unchanged since it was last displayed, keep its Markdown
+                return
+
         await set_artifact(
             name=self.memory_identifier,
             value=Markdown(raw_content),
@@ -124,17 +163,28 @@ class SimpleMemoryExtension(MemoryReminder):
             run_status=cf.RunStatus.IN_PROGRESS,
         )
 
-        if not file_path.exists():
+        raw_content = self._read_memory_file(file_path)
+        if raw_content is None:
             content = "(Memory is empty)"
         else:
-            raw_content = file_path.read_text()
-            content = view_file_content(
-                raw_content,
-                start_line=None,
-                end_line=None,
-                max_view_lines=None,
-                include_line_numbers=False,
-            )
+            try:
+                content = view_file_content(
+                    raw_content,
+                    start_line=inp.start_line,
+                    end_line=inp.end_line,
+                    max_view_lines=None,
+                    include_line_numbers=False,
+                )
+            except ValueError as e:
+                error_msg = f"Read failed: {str(e)}"
+                await context.io.system(
+                    error_msg,
+                    run_label="Reading Memory",
+                    run_status=cf.RunStatus.FAILED,
+                )
+                return MemoryOutput(
+                    content=error_msg, success=False, file_path=str(file_path)
+                )
 
         await context.io.system(
             "Memory read successfully",
@@ -157,11 +207,23 @@ class SimpleMemoryExtension(MemoryReminder):
         )
 
         warning: Optional[str] = None
-        if file_path.exists():
-            previous_content = file_path.read_text()
+        previous_content = self._read_memory_file(file_path)
+        if previous_content is not None:
             warning = f"Warning: Overwriting existing memory content (previous content had {len(previous_content)} characters)."
 
         file_path.write_text(inp.content)
+        if "\r" in inp.content:
+            # Newlines are translated when reading back, drop the entry instead
+            self._file_cache.pop(file_path, None)
+        else:
+            # Cache the written content, so that displaying it and the warning of
+            # the next write do not read the file again. The new stamp also
+            # replaces the old entry on filesystems with coarse mtime resolution.
+            stat = file_path.stat()
+            self._file_cache[file_path] = (
+                (stat.st_mtime_ns, stat.st_size),
+                inp.content,
+            )
 
         await self._display_memory(context)
 
@@ -207,6 +269,7 @@ class SimpleMemoryExtension(MemoryReminder):
                 replace_text=inp.new_str,
                 require_line_num=False,
             )
+            self._file_cache.pop(file_path, None)
 
             await self._display_memory(context)
 
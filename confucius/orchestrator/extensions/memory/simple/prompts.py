@@ -22,7 +22,7 @@ You have access to persistent memory that survives across conversation turns and
 Memory is session-isolated and automatically displayed in the UI for reference.
 """
 
-READ_MEMORY_DESCRIPTION = "Read the current contents of persistent memory to review context before making decisions or continuing work"
+READ_MEMORY_DESCRIPTION = "Read the current contents of persistent memory to review context before making decisions or continuing work. Use start_line and end_line to read only part of a long memory"
 
 WRITE_MEMORY_DESCRIPTION = "Store new information in persistent memory (warns when overwriting existing data). Use when: (1) user expresses preferences, requirements, or constraints, (2) after making significant architectural/design/implementation decisions, (3) when completing major milestones or receiving important feedback, (4) when establishing patterns/approaches/solutions that may be referenced again, (5) when conversation direction changes or new information significantly impacts the task, (6) during code reviews or iterative development cycles"
 
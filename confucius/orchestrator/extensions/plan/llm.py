@@ -1,8 +1,14 @@
 # Copyright (c) Meta Platforms, Inc. and affiliates.
 # pyre-strict
 
+import asyncio
 import html
+import json
+import os
+from bisect import bisect_left
 from enum import Enum
+from itertools import accumulate
+from typing import Any
 
 import bs4
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
@@ -12,6 +18,7 @@ from pydantic import Field, model_validator, PrivateAttr
 from ....core import types as cf
 
 from ....core.analect import AnalectRunContext
+from ....core.chat_models.bedrock.api.invoke_model import anthropic as ant
 from ....core.llm_manager import LLMParams
 from ....core.memory import CfMemory, CfMessage
 from ..token.estimator import TokenEstimatorExtension
@@ -26,6 +33,44 @@ class MessageFilterStatus(str, Enum):
 
 
 __FILTER_STATUS_KEY__ = "filter_status"
+# Values of the filter status, compared for every message on every turn
+_OMITTED: str = MessageFilterStatus.OMITTED.value
+_WILL_BE_OMITTED: str = MessageFilterStatus.WILL_BE_OMITTED.value
+
+_TEXT_EDITOR_TOOL_NAMES: frozenset[str] = frozenset(
+    {"str_replace_editor", "str_replace_based_edit_tool"}
+)
+# Commands of the text editor tool that change the file at the given path
+_TEXT_EDITOR_WRITE_COMMANDS: frozenset[str] = frozenset(
+    {
+        ant.TextEditorCommand.CREATE.value,
+        ant.TextEditorCommand.STR_REPLACE.value,
+        ant.TextEditorCommand.INSERT.value,
+        ant.TextEditorCommand.UNDO_EDIT.value,
+    }
+)
+
+
+def _get_content_block(
+    msg: CfMessage, block_type: ant.MessageContentType
+) -> dict[str, Any] | None:
+    """Get the content block of a message made of a single block of the given type."""
+    content = msg.content
+    if (
+        isinstance(content, list)
+        and len(content) == 1
+        and isinstance(content[0], dict)
+        and content[0].get("type") == block_type
+    ):
+        return content[0]
+    return None
+
+
+def _get_tool_result_key(block: dict[str, Any]) -> tuple[Any, ...]:
+    content = block.get("content")
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+    return (content, block.get("is_error"))
 
 
 class LLMPlannerExtension(TokenEstimatorExtension):
@@ -76,6 +121,18 @@ class LLMPlannerExtension(TokenEstimatorExtension):
         default=1,
         description="The index of the first message to be omitted, default to 1 to skip the first message which is the initial user request",
     )
+    tail_keep: int = Field(
+        default=0,
+        description="The minimum number of most recent messages that are never omitted. The kept messages are extended back to the closest AI message, so that they do not start with a tool result",
+    )
+    dedupe_tool_outputs: bool = Field(
+        default=True,
+        description="Whether to also omit tool calls that are repeated later in the conversation with the same tool, input and result when the planner is triggered, keeping only the most recent one",
+    )
+    supersede_writes: bool = Field(
+        default=True,
+        description="Whether to also omit file edit tool calls when the planner is triggered, once the same file is fully viewed later in the conversation",
+    )
     # If this list is empty, the planner will not be triggered
     _messages_to_be_omitted: list[CfMessage] = PrivateAttr(default_factory=list)
 
@@ -94,13 +151,110 @@ class LLMPlannerExtension(TokenEstimatorExtension):
     def stop_sequences(self) -> list[str]:
         return [f"</{self.plan_tag_name}>"]
 
+    def _get_tool_calls(
+        self, messages: list[CfMessage], start: int
+    ) -> list[tuple[int, dict[str, Any], int, dict[str, Any]]]:
+        """
+        Get the tool calls of the messages from `start` that can be omitted, in order.
+
+        Returns:
+            The (tool use message index, tool use, tool result message index,
+            tool result) of each tool call. Tool uses with more than one result
+            message are left out, since they cannot be omitted together with
+            their results.
+        """
+        tool_uses: dict[str, tuple[int, dict[str, Any]]] = {}
+        tool_results: dict[str, list[tuple[int, dict[str, Any]]]] = {}
+        for index in range(start, len(messages)):
+            msg = messages[index]
+            if msg.type == cf.MessageType.AI:
+                block = _get_content_block(msg, ant.MessageContentType.TOOL_USE)
+                if block is not None:
+                    tool_uses[block.get("id")] = (index, block)
+            elif msg.type == cf.MessageType.HUMAN:
+                block = _get_content_block(msg, ant.MessageContentType.TOOL_RESULT)
+                if block is not None:
+                    tool_results.setdefault(block.get("tool_use_id"), []).append(
+                        (index, block)
+                    )
+
+        tool_calls = []
+        for tool_use_id, (tool_use_index, tool_use) in tool_uses.items():
+            results = tool_results.get(tool_use_id)
+            if results is not None and len(results) == 1:
+                tool_calls.append((tool_use_index, tool_use, *results[0]))
+        return tool_calls
+
+    def _dedupe_tool_outputs(
+        self,
+        tool_calls: list[tuple[int, dict[str, Any], int, dict[str, Any]]],
+    ) -> list[tuple[int, int]]:
+        """
+        Find the tool calls repeated later with the same tool, input and result.
+
+        Returns:
+            The (tool use message index, tool result message index) of each
+            repeated call, so that both messages are omitted together and every
+            remaining tool use keeps its result.
+        """
+        repeated = []
+        seen: set[tuple[Any, ...]] = set()
+        # Walk back from the most recent call, which is the one that is kept
+        for tool_use_index, tool_use, result_index, result in reversed(tool_calls):
+            key = (
+                tool_use.get("name"),
+                json.dumps(tool_use.get("input"), sort_keys=True, default=str),
+                *_get_tool_result_key(result),
+            )
+            if key in seen:
+                repeated.append((tool_use_index, result_index))
+            else:
+                seen.add(key)
+        return repeated
+
+    def _supersede_writes(
+        self,
+        tool_calls: list[tuple[int, dict[str, Any], int, dict[str, Any]]],
+    ) -> list[tuple[int, int]]:
+        """
+        Find the file edits followed by a full view of the same file.
+
+        The later view shows the file with the changes of these edits, so
+        the edit calls, including their file contents, are no longer needed.
+
+        Returns:
+            The (tool use message index, tool result message index) of each
+            superseded edit
+        """
+        superseded = []
+        viewed_paths: set[str] = set()
+        # Walk back so that the paths viewed after each call are known
+        for tool_use_index, tool_use, result_index, result in reversed(tool_calls):
+            if tool_use.get("name") not in _TEXT_EDITOR_TOOL_NAMES:
+                continue
+            tool_input = tool_use.get("input")
+            if not isinstance(tool_input, dict):
+                continue
+            path, command = tool_input.get("path"), tool_input.get("command")
+            if not isinstance(path, str) or not isinstance(command, str):
+                continue
+            path = os.path.normpath(path)
+            if command == ant.TextEditorCommand.VIEW:
+                if tool_input.get("view_range") is None and not result.get("is_error"):
+                    viewed_paths.add(path)
+            elif command in _TEXT_EDITOR_WRITE_COMMANDS and path in viewed_paths:
+                superseded.append((tool_use_index, result_index))
+        return superseded
+
     async def on_memory(self, memory: CfMemory, context: AnalectRunContext) -> CfMemory:
-        memory.messages = [
-            msg
-            for msg in memory.messages
-            if msg.additional_kwargs.get(__FILTER_STATUS_KEY__)
-            != MessageFilterStatus.OMITTED.value
-        ]
+        # Drop omitted messages in place, the list is owned by the memory
+        messages = memory.messages
+        kept = 0
+        for msg in messages:
+            if msg.additional_kwargs.get(__FILTER_STATUS_KEY__) != _OMITTED:
+                messages[kept] = msg
+                kept += 1
+        del messages[kept:]
         prompt_lengths = await self.get_prompt_token_lengths(memory.messages)
         total_length = sum(prompt_lengths)
         if (
@@ -111,17 +265,55 @@ class LLMPlannerExtension(TokenEstimatorExtension):
             self._messages_to_be_omitted.clear()
             return memory
 
-        for i in range(self.start_index, len(memory.messages)):
-            if (
-                total_length <= self.min_prompt_length
-                and memory.messages[i].type == cf.MessageType.AI
-            ):
-                break
-            memory.messages[i].additional_kwargs[
-                __FILTER_STATUS_KEY__
-            ] = MessageFilterStatus.WILL_BE_OMITTED.value
-            self._messages_to_be_omitted.append(memory.messages[i])
-            total_length -= prompt_lengths[i]
+        # Omit messages from start_index until the remaining prompt fits in
+        # min_prompt_length, then up to the next AI message. The remaining length
+        # only decreases, so the first fitting message is found by bisection.
+        messages = memory.messages
+        start = self.start_index
+        end = start
+        tail_start = len(messages)
+        if start < len(messages):
+            prefix_lengths = list(accumulate(prompt_lengths, initial=0))
+            end = bisect_left(
+                prefix_lengths,
+                total_length - self.min_prompt_length + prefix_lengths[start],
+                lo=start,
+                hi=len(messages),
+            )
+            while end < len(messages) and messages[end].type != cf.MessageType.AI:
+                end += 1
+
+            if self.tail_keep > 0:
+                # Keep the tail from the closest AI message before it
+                tail_start = max(len(messages) - self.tail_keep, start)
+                while (
+                    tail_start > start
+                    and messages[tail_start].type != cf.MessageType.AI
+                ):
+                    tail_start -= 1
+                end = min(end, tail_start)
+
+        omitted_indices = list(range(start, end))
+        if self.dedupe_tool_outputs or self.supersede_writes:
+            # The plan rewrites the prompt from start_index anyway, so redundant
+            # tool calls after the summarized messages are omitted along with them
+            tool_calls = self._get_tool_calls(messages, end)
+            redundant_calls = set()
+            if self.dedupe_tool_outputs:
+                redundant_calls.update(self._dedupe_tool_outputs(tool_calls))
+            if self.supersede_writes:
+                redundant_calls.update(self._supersede_writes(tool_calls))
+            omitted_indices += sorted(
+                index
+                for tool_use_index, result_index in redundant_calls
+                if result_index < tail_start
+                for index in (tool_use_index, result_index)
+            )
+
+        for index in omitted_indices:
+            msg = messages[index]
+            msg.additional_kwargs[__FILTER_STATUS_KEY__] = _WILL_BE_OMITTED
+            self._messages_to_be_omitted.append(msg)
         return memory
 
     @property
@@ -141,10 +333,12 @@ class LLMPlannerExtension(TokenEstimatorExtension):
         context: AnalectRunContext,
     ) -> str:
         plan_text: str | None = None
+        # The conversation is converted once, retries only append the feedback
         plan_prompt = self._get_plan_prompt(messages)
+        plan_inputs = self._plan_inputs
         chat = context.llm_manager._get_chat(params=self.llm_params)
         while True:
-            messages = plan_prompt.format_messages(**self._plan_inputs)
+            messages = plan_prompt.format_messages(**plan_inputs)
             response = await context.invoke(chat, messages)
             content = response.content
             res = (
@@ -154,9 +348,18 @@ class LLMPlannerExtension(TokenEstimatorExtension):
                     ct.get("text", "") if isinstance(ct, dict) else ct for ct in content
                 )
             )
-            soup = bs4.BeautifulSoup(res, "html.parser")
-            plan_tag = soup.find(name=self.plan_tag_name)
-            summary_tag = soup.find(name=self.summary_tag_name)
+            # Tag names are case-insensitive in html.parser, a response that does
+            # not mention both tags cannot contain them and is not parsed
+            lowered = res.lower()
+            if (
+                f"<{self.plan_tag_name}".lower() in lowered
+                and f"<{self.summary_tag_name}".lower() in lowered
+            ):
+                soup = bs4.BeautifulSoup(res, "html.parser")
+                plan_tag = soup.find(name=self.plan_tag_name)
+                summary_tag = soup.find(name=self.summary_tag_name)
+            else:
+                plan_tag = summary_tag = None
             if plan_tag is None or summary_tag is None:
                 err_msg = f"No <{self.plan_tag_name}> or <{self.summary_tag_name}> tag found. Please write your plan in the <{self.plan_tag_name}> tag and summary in the <{self.summary_tag_name}> tag."
                 await context.io.system("---\n" + err_msg, run_label="Planning...")
@@ -168,15 +371,16 @@ class LLMPlannerExtension(TokenEstimatorExtension):
                 plan_text = html.unescape(summary_tag.prettify())
                 first_step_tag = plan_tag.find(self.step_tag_name, recursive=False)
                 if first_step_tag:
-                    # Get the next sibling after the first step
-                    current = first_step_tag.next_sibling
-                    # Remove all following siblings
-                    while current:
-                        next_sibling = current.next_sibling
-                        current.extract()
-                        current = next_sibling
+                    # Move the contents up to the first step into a fresh plan tag,
+                    # rather than removing all the following steps one by one
+                    first_plan_tag = soup.new_tag(
+                        plan_tag.name, attrs=dict(plan_tag.attrs)
+                    )
+                    first_plan_tag.extend(
+                        plan_tag.contents[: plan_tag.index(first_step_tag) + 1]
+                    )
 
-                    plan_text += html.unescape(plan_tag.prettify())
+                    plan_text += html.unescape(first_plan_tag.prettify())
 
                 break
         assert plan_text is not None
@@ -222,8 +426,8 @@ class LLMPlannerExtension(TokenEstimatorExtension):
         # rather than as an AI message which would require a thinking block when thinking is enabled
         plan_msg = CfMessage(content=plan_text, type=cf.MessageType.HUMAN)
         new_messages = [plan_msg] + [
-            # Here we reconstruct the message to make sure the sequence id is incremental
-            CfMessage.parse_obj(msg.dict())
+            # Here we copy the message to make sure the sequence id is incremental
+            msg.copy_with_new_sequence_id()
             for msg in self.additional_messages
         ]
         context.memory_manager.add_messages(new_messages)
@@ -231,16 +435,15 @@ class LLMPlannerExtension(TokenEstimatorExtension):
         messages = [
             msg
             for msg in messages
-            if (
-                msg.additional_kwargs.get(__FILTER_STATUS_KEY__)
-                != MessageFilterStatus.WILL_BE_OMITTED.value
-            )
-        ] + [lc_msg for msg in new_messages for lc_msg in (await msg.to_lc_messages())]
+            if msg.additional_kwargs.get(__FILTER_STATUS_KEY__) != _WILL_BE_OMITTED
+        ]
+        for lc_messages in await asyncio.gather(
+            *(msg.to_lc_messages() for msg in new_messages)
+        ):
+            messages.extend(lc_messages)
 
         for msg in self._messages_to_be_omitted:
-            msg.additional_kwargs[__FILTER_STATUS_KEY__] = (
-                MessageFilterStatus.OMITTED.value
-            )
+            msg.additional_kwargs[__FILTER_STATUS_KEY__] = _OMITTED
         self._messages_to_be_omitted.clear()
 
         return messages
@@ -20,21 +20,26 @@ def prompt_to_convo_tag(messages: list[BaseMessage]) -> list[BaseMessage]:
     """
     Convert LC prompt value to a list of LC Messages that represents a conversation XML tag.
     """
-    out_msgs: list[BaseMessage] = [HumanMessage(content="<conversation>")]
+    # Contents are collected as chunks and joined once per output message,
+    # since concatenating to the message content copies it every time
+    out_msgs: list[BaseMessage] = []
+    chunks: list[str] = ["<conversation>"]
     for msg in messages:
-        out_msgs[-1].content += f'\n<message role="{msg.type}">'
+        chunks.append(f'\n<message role="{msg.type}">')
         if isinstance(msg, (AIMessage, SystemMessage)):
-            out_msgs[-1].content += "\n" + get_content_str(msg.content)
+            chunks += ("\n", get_content_str(msg.content))
         else:
             assert isinstance(msg, HumanMessage)
             if has_attachment(msg):
+                out_msgs.append(HumanMessage(content="".join(chunks)))
                 out_msgs.append(msg)
-                out_msgs.append(HumanMessage(content=""))
+                chunks = []
             else:
-                out_msgs[-1].content += "\n" + get_content_str(msg.content)
+                chunks += ("\n", get_content_str(msg.content))
 
-        out_msgs[-1].content += "\n</message>"
-    out_msgs[-1].content += "\n</conversation>"
+        chunks.append("\n</message>")
+    chunks.append("\n</conversation>")
+    out_msgs.append(HumanMessage(content="".join(chunks)))
     return out_msgs
 
 
@@ -21,6 +21,14 @@ from pydantic import Field, PrivateAttr
 
 UpdateTaskProgressInput = MeterData
 
+# The input schema is static, so the tool is built once rather than on each
+# `tools` access
+_UPDATE_TASK_PROGRESS_TOOL: ant.Tool = ant.Tool(
+    name=UPDATE_TASK_PROGRESS_TOOL_NAME,
+    description=UPDATE_TASK_PROGRESS_TOOL_DESCRIPTION,
+    input_schema=UpdateTaskProgressInput.model_json_schema(),
+)
+
 
 # Default continue message
 DEFAULT_CONTINUE_MESSAGE = """\
@@ -77,13 +85,7 @@ class SoloModeExtension(ToolUseExtension):
 
         if self.enable_tool_use:
             # Add update_task_progress tool
-            tools.append(
-                ant.Tool(
-                    name=UPDATE_TASK_PROGRESS_TOOL_NAME,
-                    description=UPDATE_TASK_PROGRESS_TOOL_DESCRIPTION,
-                    input_schema=UpdateTaskProgressInput.model_json_schema(),
-                )
-            )
+            tools.append(_UPDATE_TASK_PROGRESS_TOOL)
 
         return tools
 
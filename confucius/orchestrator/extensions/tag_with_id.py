@@ -3,6 +3,7 @@
 
 import html
 import re
+from functools import lru_cache
 
 import bs4
 from pydantic import Field, PrivateAttr
@@ -14,6 +15,53 @@ from ..tags import unescape, unescaped_tag_content
 from .base import Extension
 
 
+@lru_cache(maxsize=None)
+def _compile_tag_pattern(tag_name: str) -> re.Pattern[str]:
+    """Compile the pattern of a tag and its content, shared by all extensions of the tag."""
+    return re.compile(
+        rf"(?P<opening_tag><{tag_name}(?:\s+[^>]*)?>)"
+        rf"(?P<content>.*?)"
+        rf"(?P<closing_tag></{tag_name}>)",
+        flags=re.DOTALL,
+    )
+
+
+@lru_cache(maxsize=None)
+def _compile_opening_tag_pattern(tag_name: str) -> re.Pattern[str]:
+    return re.compile(rf"<{tag_name}(?:\s+[^>]*)?>")
+
+
+def _escape_tag_contents(text: str, tag_name: str) -> str:
+    """
+    Escape the contents of the tags in a text, same as substituting the matches of
+    `_compile_tag_pattern(tag_name)` with their escaped content.
+
+    The closing tag is located with `str.find` rather than the lazy `.*?` of the
+    pattern, which tries to match the closing tag after every character.
+    """
+    opening_pattern = _compile_opening_tag_pattern(tag_name)
+    closing_tag = f"</{tag_name}>"
+    chunks = []
+    pos = 0
+    while (match := opening_pattern.search(text, pos)) is not None:
+        content_start = match.end()
+        content_end = text.find(closing_tag, content_start)
+        if content_end < 0:
+            # Later opening tags end after this one, so they are not closed either
+            break
+        chunks += (
+            text[pos:content_start],
+            html.escape(text[content_start:content_end], quote=False),
+            closing_tag,
+        )
+        pos = content_end + len(closing_tag)
+
+    if not chunks:
+        return text
+    chunks.append(text[pos:])
+    return "".join(chunks)
+
+
 class TagWithIDExtension(Extension):
     tag_name: str = Field(..., description="The tag name that the extension handles")
     default_identifier: str | None = Field(None, description="The default identifier")
@@ -29,12 +77,7 @@ class TagWithIDExtension(Extension):
     @property
     def tag_pattern(self) -> re.Pattern[str]:
         if self._tag_pattern is None:
-            self._tag_pattern = re.compile(
-                rf"(?P<opening_tag><{self.tag_name}(?:\s+[^>]*)?>)"
-                rf"(?P<content>.*?)"
-                rf"(?P<closing_tag></{self.tag_name}>)",
-                flags=re.DOTALL,
-            )
+            self._tag_pattern = _compile_tag_pattern(self.tag_name)
         return self._tag_pattern
 
     async def on_add_messages(
@@ -51,16 +94,7 @@ class TagWithIDExtension(Extension):
         context: AnalectRunContext,
     ) -> str:
         if self.escape_tag_content:
-
-            def escape_match(match: re.Match[str]) -> str:
-                opening_tag: str = match.group("opening_tag")
-                content: str = match.group("content")
-                closing_tag: str = match.group("closing_tag")
-
-                escaped_content: str = html.escape(content, quote=False)
-                return f"{opening_tag}{escaped_content}{closing_tag}"
-
-            return self.tag_pattern.sub(escape_match, text)
+            return _escape_tag_contents(text, self.tag_name)
         return text
 
     async def on_tag_with_id(
@@ -2,6 +2,8 @@
 # pyre-strict
 
 
+from typing import Any
+
 import bs4
 from pydantic import BaseModel, Field
 
@@ -19,6 +21,14 @@ class ThinkingInput(BaseModel):
     thought: str = Field(..., description="Your thoughts.")
 
 
+# The input schema is static, so it is generated once rather than on each
+# `tools` access
+_THINKING_INPUT_SCHEMA: dict[str, Any] = ThinkingInput.schema()
+
+# Name of the thinking tag, read once rather than building a tag on each `on_tag`
+_THINKING_TAG_NAME: str = Thinking().name
+
+
 class ThinkingExtension(ToolUseExtension):
     name: str = "think"
     included_in_system_prompt: bool = False
@@ -28,7 +38,7 @@ class ThinkingExtension(ToolUseExtension):
     )
 
     async def on_tag(self, tag: bs4.Tag, context: AnalectRunContext) -> None:
-        if tag.name == Thinking().name:
+        if tag.name == _THINKING_TAG_NAME:
             await context.io.divider()
             await context.io.system(
                 unescaped_tag_content(tag),
@@ -44,7 +54,7 @@ class ThinkingExtension(ToolUseExtension):
                 ant.Tool(
                     name=self.name,
                     description=THINKING_TOOL_USE_PROMPT,
-                    input_schema=ThinkingInput.schema(),
+                    input_schema=_THINKING_INPUT_SCHEMA,
                 )
             ]
 
@@ -53,10 +63,13 @@ class ThinkingExtension(ToolUseExtension):
     async def on_tool_use(
         self, tool_use: ant.MessageContentToolUse, context: AnalectRunContext
     ) -> ant.MessageContentToolResult:
-        inp = ThinkingInput.parse_obj(tool_use.input)
+        thought = tool_use.input.get("thought")
+        if not isinstance(thought, str):
+            # Let validation report the invalid input
+            thought = ThinkingInput.parse_obj(tool_use.input).thought
         await context.io.divider()
         await context.io.system(
-            inp.thought,
+            thought,
             run_status=cf.RunStatus.COMPLETED,
             run_label="Thinking",
         )
@@ -14,7 +14,7 @@ from ....core.chat_models.bedrock.api.invoke_model import anthropic as ant
 from ....core.memory import CfMessage
 from ..base import Extension
 
-from .utils import get_prompt_char_lengths, get_prompt_token_lengths
+from .utils import ContentLengthCache, get_prompt_char_lengths, get_prompt_token_lengths
 
 NUM_CHARS_PER_TOKEN_ESTIMATE_KEY = "num_chars_per_token_estimate"
 DEFAULT_NUM_CHARS_PER_TOKEN = 3.0
@@ -24,6 +24,15 @@ MAX_NUM_CHARS_PER_TOKEN = 4.0
 class TokenEstimatorExtension(Extension):
     _last_prompt_char_length: int | None = PrivateAttr(default=None)
     _last_prompt_token_length: int | None = PrivateAttr(default=None)
+    # Reuses the lengths of unchanged memory message contents across turns
+    _content_length_cache: ContentLengthCache = PrivateAttr(
+        default_factory=ContentLengthCache
+    )
+    # Reuses the lengths of unchanged prompt message contents across invocations,
+    # kept apart from the memory cache since it measures different message lists
+    _prompt_content_length_cache: ContentLengthCache = PrivateAttr(
+        default_factory=ContentLengthCache
+    )
 
     async def _on_invoke_llm(
         self,
@@ -38,7 +47,9 @@ class TokenEstimatorExtension(Extension):
         context: AnalectRunContext,
     ) -> list[BaseMessage]:
         messages = await self._on_invoke_llm(messages, context)
-        self._last_prompt_char_length = sum(await get_prompt_char_lengths(messages))
+        self._last_prompt_char_length = sum(
+            await get_prompt_char_lengths(messages, self._prompt_content_length_cache)
+        )
         return messages
 
     async def on_llm_response(
@@ -47,8 +58,8 @@ class TokenEstimatorExtension(Extension):
         context: AnalectRunContext,
     ) -> BaseMessage:
         try:
-            response = ant.Response.parse_obj(message.response_metadata)
-            usage = response.usage
+            # Only the usage is needed, so the content blocks are not validated
+            usage = ant.Usage.parse_obj(message.response_metadata["usage"])
             self._last_prompt_token_length = (
                 usage.input_tokens
                 + (usage.cache_creation_input_tokens or 0)
@@ -143,4 +154,6 @@ class TokenEstimatorExtension(Extension):
             self.get_num_chars_per_token_estimate() or DEFAULT_NUM_CHARS_PER_TOKEN
         )
         num_chars_per_token = min(num_chars_per_token, MAX_NUM_CHARS_PER_TOKEN)
-        return await get_prompt_token_lengths(messages, num_chars_per_token)
+        return await get_prompt_token_lengths(
+            messages, num_chars_per_token, self._content_length_cache
+        )
@@ -3,20 +3,24 @@
 import logging
 
 import math
-from typing import Any
+from typing import Any, Collection, Optional
 
 from langchain_core.messages import BaseMessage
 
 from ....core.memory import CfMessage
 
 logger: logging.Logger = logging.getLogger(__name__)
-EXCLUDE_KEYS: list[str] = ["signature"]
+EXCLUDE_KEYS: frozenset[str] = frozenset({"signature"})
 
 
 def get_content_str(
-    content: str | list[str | dict[str, Any]], exclude_keys: list[str] | None = None
+    content: str | list[str | dict[str, Any]],
+    exclude_keys: Collection[str] | None = None,
 ) -> str:
-    exclude_keys = exclude_keys or EXCLUDE_KEYS
+    if not exclude_keys:
+        exclude_keys = EXCLUDE_KEYS
+    elif not isinstance(exclude_keys, frozenset):
+        exclude_keys = frozenset(exclude_keys)
 
     if isinstance(content, str):
         return content
@@ -26,60 +30,145 @@ def get_content_str(
             if isinstance(item, str):
                 res.append(item)
             elif isinstance(item, dict):
-                res.append(
-                    str({k: v for k, v in item.items() if k not in exclude_keys})
-                )
+                if exclude_keys.isdisjoint(item):
+                    # Nothing to exclude, format the item without copying it
+                    res.append(str(item))
+                else:
+                    res.append(
+                        str({k: v for k, v in item.items() if k not in exclude_keys})
+                    )
             else:
                 raise ValueError(f"Unexpected content type: {type(item)}")
         return "\n".join(res)
 
 
-async def _get_text_attachment_length(msg: BaseMessage | CfMessage) -> int:
+class ContentLengthCache:
     """
-    Get the total length of text attachments in a message.
+    Cache of `get_content_str` lengths for list message contents.
+
+    Memory messages keep the same content objects across turns, so the lengths
+    of list contents (whose string form is expensive to build) are reused while
+    the content is the same object with the same number of items and item keys.
+    Langchain messages copy their content, so a content that is not the same
+    object is compared to the content at the same position in the last call
+    instead, which is cheap since the copies share their values. Only the
+    contents of the last call are kept.
     """
-    total_length = 0
 
-    if isinstance(msg, CfMessage):
-        # Approximate by summing lengths of file attachments' data/urls if present.
-        for att in msg.attachments:
-            try:
-                content = att.content
-                # Cf types union: FileAttachment | LinkAttachment | ArtifactInfoAttachment
-                data = getattr(content, "data", None) or getattr(content, "url", None)
-                if isinstance(data, str):
-                    total_length += len(data)
-            except Exception:
-                # Be conservative on failures
+    def __init__(self) -> None:
+        self._entries: dict[
+            int, tuple[list[str | dict[str, Any]], tuple[int, ...], int]
+        ] = {}
+        self._ordered_entries: list[
+            Optional[tuple[list[str | dict[str, Any]], tuple[int, ...], int]]
+        ] = []
+
+    def get_lengths(
+        self, contents: list[str | list[str | dict[str, Any]]]
+    ) -> list[int]:
+        """
+        Get the lengths of `get_content_str` of contents.
+
+        Args:
+            contents: The contents of the messages of a prompt
+
+        Returns:
+            list[int]: The lengths of the contents in characters
+        """
+        entries = {}
+        ordered_entries = []
+        lengths = []
+        for index, content in enumerate(contents):
+            if not isinstance(content, list):
+                lengths.append(len(get_content_str(content)))
+                ordered_entries.append(None)
                 continue
-        return total_length
 
+            # Detects items replaced or keys added in place, e.g. cache control
+            fingerprint = tuple(
+                len(item) if isinstance(item, (str, dict)) else -1 for item in content
+            )
+            entry = self._entries.get(id(content))
+            if entry is None or entry[0] is not content or entry[1] != fingerprint:
+                entry = (
+                    self._ordered_entries[index]
+                    if index < len(self._ordered_entries)
+                    else None
+                )
+                if entry is None or entry[1] != fingerprint or entry[0] != content:
+                    entry = (content, fingerprint, len(get_content_str(content)))
+                else:
+                    # Copy of the cached content, keep the new object
+                    entry = (content, fingerprint, entry[2])
+            entries[id(content)] = entry
+            ordered_entries.append(entry)
+            lengths.append(entry[2])
+
+        self._entries = entries
+        self._ordered_entries = ordered_entries
+        return lengths
+
+
+def _get_text_attachment_length(msg: BaseMessage | CfMessage) -> int:
+    """
+    Get the total length of text attachments in a message.
+
+    This is synchronous since it does no I/O, so that measuring a prompt does
+    not create and await a coroutine per message.
+    """
+    if not isinstance(msg, CfMessage) or not msg.attachments:
+        return 0
+
+    # Approximate by summing lengths of file attachments' data/urls if present.
+    # Cf types union: FileAttachment | LinkAttachment | ArtifactInfoAttachment,
+    # plain models whose attribute lookups do not raise
+    total_length = 0
+    for att in msg.attachments:
+        content = att.content
+        data = getattr(content, "data", None) or getattr(content, "url", None)
+        if isinstance(data, str):
+            total_length += len(data)
     return total_length
 
 
+def _get_prompt_char_lengths(
+    messages: list[BaseMessage] | list[CfMessage],
+    content_length_cache: Optional[ContentLengthCache],
+) -> list[int]:
+    """
+    Single pass over the messages shared by the character and token lengths.
+    """
+    content_length_cache = content_length_cache or ContentLengthCache()
+    content_lengths = content_length_cache.get_lengths(
+        [msg.content for msg in messages]
+    )
+    return [
+        content_length + _get_text_attachment_length(msg)
+        for msg, content_length in zip(messages, content_lengths)
+    ]
+
+
 async def get_prompt_char_lengths(
     messages: list[BaseMessage] | list[CfMessage],
+    content_length_cache: Optional[ContentLengthCache] = None,
 ) -> list[int]:
     """
     Get the lengths of a prompt in characters per message. Text attachments are counted, but image attachments are not counted.
 
     Args:
         messages (list[BaseMessage]): The list of messages to get the lengths of.
+        content_length_cache (ContentLengthCache, optional): Cache of the content lengths to reuse across calls.
 
     Returns:
         list[int]: The lengths of the prompt in characters per message.
     """
-    lengths = []
-    for msg in messages:
-        attachment_length = await _get_text_attachment_length(msg)
-        lengths.append(len(get_content_str(msg.content)) + attachment_length)
-
-    return lengths
+    return _get_prompt_char_lengths(messages, content_length_cache)
 
 
 async def get_prompt_token_lengths(
     messages: list[BaseMessage] | list[CfMessage],
     num_chars_per_token: float = 3.0,
+    content_length_cache: Optional[ContentLengthCache] = None,
 ) -> list[int]:
     """
     Get the lengths of a prompt in tokens per message. Text attachments are counted, but image attachments are not counted.
@@ -87,20 +176,13 @@ async def get_prompt_token_lengths(
     Args:
         messages (list[BaseMessage]): The list of messages to get the lengths of.
         num_chars_per_token (float, optional): The number of characters per token. Defaults to 3.0. This is a rough estimate, based on https://help.openai.com/en/articles/4936856-what-are-tokens-and-how-to-count-them.
+        content_length_cache (ContentLengthCache, optional): Cache of the content lengths to reuse across calls.
 
     Returns:
         list[int]: The lengths of the prompt in tokens per message.
     """
     # Use rough estimate
-
-    lengths = []
-    for msg in messages:
-        attachment_length = await _get_text_attachment_length(msg)
-        lengths.append(
-            math.ceil(
-                (len(get_content_str(msg.content)) + attachment_length)
-                / num_chars_per_token
-            )
-        )
-
-    return lengths
+    return [
+        math.ceil(char_length / num_chars_per_token)
+        for char_length in _get_prompt_char_lengths(messages, content_length_cache)
+    ]
@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from typing import Any, Callable
 
 from langchain_core.runnables import RunnableLambda
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
 from ...core.analect import AnalectRunContext
 
@@ -37,6 +37,14 @@ class ToolUseExtension(Extension, ABC):
         "tool",
         description="The run type of the runnable, only used when enabled_tracing is True",
     )
+    # Names of the tools, computed on first use and reset when a field is assigned
+    _tool_names: frozenset[str] | None = PrivateAttr(None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_") and self.__pydantic_private__ is not None:
+            # The tools may depend on the configuration
+            self._tool_names = None
 
     def get_non_retryable_exceptions_message(
         self, tool_use_id: str, exc: BaseException
@@ -108,8 +116,10 @@ class ToolUseExtension(Extension, ABC):
             raise
 
     @property
-    async def all_tool_names(self) -> set[str]:
-        return {tool.name for tool in (await self.tools)}
+    async def all_tool_names(self) -> frozenset[str]:
+        if self._tool_names is None:
+            self._tool_names = frozenset(tool.name for tool in (await self.tools))
+        return self._tool_names
 
     async def _on_tool_use_impl(
         self,
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import gc
+from pathlib import Path
+import sys
+from typing import Any, AsyncIterator
+import weakref
+
+import pytest
+from pydantic import BaseModel
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from confucius.orchestrator.extensions.function import utils
+
+
+class Point(BaseModel):
+    x: int
+    y: int = 0
+
+
+@dataclass
+class Options:
+    verbose: bool
+    depth: int = 1
+
+
+def sync_func(
+    name: str, point: Point, options: Options = Options(False), count: int = 2
+) -> Any:
+    return (name, point, options, count)
+
+
+async def async_func(
+    name: str, point: Point, options: Options = Options(False), count: int = 2
+) -> Any:
+    return (name, point, options, count)
+
+
+async def async_gen_func(
+    name: str, point: Point, options: Options = Options(False), count: int = 2
+) -> AsyncIterator[Any]:
+    for index in range(count):
+        yield (index, name, point, options)
+
+
+INPUTS: list[dict[str, Any]] = [
+    {"name": "a", "point": {"x": 1}},
+    {"name": "a", "point": {"x": 1, "y": 2}, "count": 3},
+    {"name": "a", "point": Point(x=4), "options": {"verbose": True, "extra": 1}},
+    {"name": "a", "point": {"x": 1}, "options": Options(True, 5), "unknown": 1},
+    {"point": {"x": 1}},
+]
+
+
+def _wrappers(func: Any, monkeypatch: pytest.MonkeyPatch) -> tuple[Any, Any]:
+    monkeypatch.delenv("CCA_CODEGEN_WRAPPERS", raising=False)
+    generic = utils.get_single_kwargs_function(func)
+    monkeypatch.setenv("CCA_CODEGEN_WRAPPERS", "1")
+    generated = utils.get_single_kwargs_function(func)
+    assert generated.__code__ is not generic.__code__
+    assert generated.__name__ == func.__name__
+    return generic, generated
+
+
+def _outcome(call: Any) -> Any:
+    try:
+        return ("ok", call())
+    except TypeError as exc:
+        return ("error", type(exc))
+
+
+async def _async_outcome(call: Any) -> Any:
+    try:
+        return ("ok", await call())
+    except TypeError as exc:
+        return ("error", type(exc))
+
+
+def test_generated_sync_wrapper_matches_generic(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    generic, generated = _wrappers(sync_func, monkeypatch)
+    for kwargs in INPUTS:
+        assert _outcome(lambda: generated(dict(kwargs))) == _outcome(
+            lambda: generic(dict(kwargs))
+        )
+    with pytest.raises(TypeError, match="dictionary"):
+        generated([])
+
+
+@pytest.mark.asyncio
+async def test_generated_async_wrapper_matches_generic(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    generic, generated = _wrappers(async_func, monkeypatch)
+    for kwargs in INPUTS:
+        assert await _async_outcome(
+            lambda: generated(dict(kwargs))
+        ) == await _async_outcome(lambda: generic(dict(kwargs)))
+
+
+@pytest.mark.asyncio
+async def test_generated_async_gen_wrapper_matches_generic(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    generic, generated = _wrappers(async_gen_func, monkeypatch)
+
+    async def collect(wrapper: Any, kwargs: dict[str, Any]) -> list[Any]:
+        return [item async for item in wrapper(kwargs)]
+
+    for kwargs in INPUTS:
+        assert await _async_outcome(
+            lambda: collect(generated, dict(kwargs))
+        ) == await _async_outcome(lambda: collect(generic, dict(kwargs)))
+
+
+def test_env_flag(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("CCA_CODEGEN_WRAPPERS", raising=False)
+    assert not utils._env_flag("CCA_CODEGEN_WRAPPERS")
+    for value in ("1", "true", " Yes ", "ON"):
+        monkeypatch.setenv("CCA_CODEGEN_WRAPPERS", value)
+        assert utils._env_flag("CCA_CODEGEN_WRAPPERS")
+    monkeypatch.setenv("CCA_CODEGEN_WRAPPERS", "0")
+    assert not utils._env_flag("CCA_CODEGEN_WRAPPERS")
+
+
+def test_dropped_closure_is_collected() -> None:
+    class Captured:
+        pass
+
+    def make_closure() -> tuple[Any, weakref.ref[Captured]]:
+        captured = Captured()
+
+        def search(query: str, limit: int = 10) -> Any:
+            return (captured, query, limit)
+
+        return search, weakref.ref(captured)
+
+    func, captured_ref = make_closure()
+    wrapper = utils.get_single_kwargs_function(func)
+    assert wrapper({"query": "q"})[1:] == ("q", 10)
+    utils.generate_function_json_schema_dict(func)
+    assert utils.generate_function_json_schema(
+        func
+    ) == utils.generate_function_json_schema(func)
+    assert utils._get_signature(func) is utils._get_signature(func)
+
+    del func, wrapper
+    gc.collect()
+    assert captured_ref() is None
+
+
+def test_unhashable_callable_signature() -> None:
+    class Unhashable:
+        __hash__ = None  # type: ignore[assignment]
+
+        def __call__(self, value: int) -> int:
+            return value
+
+    assert list(utils._get_signature(Unhashable()).parameters) == ["value"]
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import codecs
+import locale
+import os
+from pathlib import Path
+import random
+import re
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from confucius.orchestrator.extensions.file.utils import replace_in_file
+from confucius.orchestrator.extensions.memory.hierarchical import utils
+from confucius.orchestrator.extensions.memory.hierarchical.cache import (
+    MemoryTreeCache,
+)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "literals"),
+    [
+        ("hello world", ["hello world"]),
+        ("foo.*bar", ["foo", "bar"]),
+        ("^foo$", ["foo"]),
+        ("colou?r", ["colo", "r"]),
+        ("ab*c", ["a", "c"]),
+        ("ab+c", ["ab", "c"]),
+        ("ab{2,3}c", ["a", "c"]),
+        ("ab*?c", ["a", "c"]),
+        ("(foo)bar", ["bar"]),
+        ("(foo)?bar", ["bar"]),
+        # Alternations
+        ("foo|bar", []),
+        ("(foo|bar)baz", []),
+        # Inline flags and other extensions
+        ("(?i)foo", []),
+        ("(?x) f o o", []),
+        ("(?:foo)bar", []),
+        # Character classes
+        ("[abc]def", ["def"]),
+        ("x[]a]y", ["x", "y"]),
+        ("x[^]a]y", ["x", "y"]),
+        ("x[\\]|]y", []),
+        ("x[a\\]b]y", ["x", "y"]),
+        # Escapes
+        ("a\\.b", ["a", "b"]),
+        ("\\d+px", ["px"]),
+        ("\\x41bc", ["bc"]),
+        ("\\u00e9t\\N{BULLET}e", ["t", "e"]),
+        ("(a)\\1bc", ["bc"]),
+        ("\\0123x", ["x"]),
+        ("foo\\?", ["foo"]),
+        # Non-ASCII characters
+        ("café", ["caf"]),
+        ("naïve", ["na", "ve"]),
+    ],
+)
+def test_extract_regex_literals(pattern: str, literals: list[str]) -> None:
+    re.compile(pattern)
+    assert utils._extract_regex_literals(pattern) == literals
+
+
+def test_get_content_pattern_literals() -> None:
+    assert utils.get_content_pattern_literals(None) == []
+    assert utils.get_content_pattern_literals("Foo.*BAR") == ["foo", "bar"]
+    assert utils.get_content_pattern_literals("(?i)Foo") == []
+    # Invalid regexes are searched as substrings
+    assert utils.get_content_pattern_literals("Foo(") == ["foo("]
+    assert utils.get_content_pattern_literals("Ä[") == ["ä["]
+
+
+_PATTERN_TOKENS = [
+    "a",
+    "B",
+    "ab",
+    "c",
+    ".",
+    "?",
+    "*",
+    "+",
+    "{2}",
+    "{1,2}",
+    "[ab]",
+    "[^c]",
+    "\\.",
+    "\\x61",
+    "\\w",
+    "\\b",
+    "(",
+    ")",
+    "|",
+    "^",
+    "$",
+    "(?i)",
+    "é",
+]
+
+
+def test_literals_are_contained_in_matches() -> None:
+    rng = random.Random(0)
+    checked = 0
+    for _ in range(3000):
+        pattern = "".join(rng.choices(_PATTERN_TOKENS, k=rng.randint(1, 6)))
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            continue
+
+        literals = utils.get_content_pattern_literals(pattern)
+        for _ in range(20):
+            content = "".join(rng.choices("aAbBc. \n", k=rng.randint(0, 12)))
+            if regex.search(content) is not None:
+                checked += 1
+                lowered = content.lower()
+                assert all(literal in lowered for literal in literals), (
+                    pattern,
+                    content,
+                )
+    assert checked > 1000
+
+
+def test_may_contain(tmp_path: Path) -> None:
+    (tmp_path / "ascii.md").write_text("Hello World")
+    (tmp_path / "unicode.md").write_text("Grüße")
+    cache = MemoryTreeCache()
+    nodes = {node.name: node for node in cache.load(tmp_path).nodes}
+
+    ascii_node = nodes["ascii.md"]
+    assert cache.may_contain(ascii_node, [])
+    assert cache.may_contain(ascii_node, ["hello", "world"])
+    assert not cache.may_contain(ascii_node, ["hello", "there"])
+    # Non-ASCII content is never excluded
+    assert cache.may_contain(nodes["unicode.md"], ["missing"])
+
+    # Nodes whose content differs from the cached file are not excluded
+    changed = ascii_node.model_copy(update={"content": "other"})
+    assert cache.may_contain(changed, ["missing"])
+
+
+_FILE_TOKENS = ["ab", "c", "é", "x\n", "\n", " ", "\t", "  \n", "\r", "\ufeff"]
+
+
+def _random_text(rng: random.Random, max_tokens: int) -> str:
+    return "".join(rng.choices(_FILE_TOKENS, k=rng.randint(0, max_tokens)))
+
+
+@pytest.mark.skipif(
+    os.linesep != "\n"
+    or codecs.lookup(locale.getpreferredencoding(False)).name != "utf-8",
+    reason="replace_unique_in_file only applies to UTF-8 files with LF newlines",
+)
+def test_replace_unique_in_file_matches_replace_in_file(tmp_path: Path) -> None:
+    rng = random.Random(0)
+    fast_path = tmp_path / "fast.md"
+    slow_path = tmp_path / "slow.md"
+    num_in_place = num_rewritten = 0
+    for _ in range(3000):
+        content = _random_text(rng, 12)
+        if content and rng.random() < 0.8:
+            # Mostly search for text that is in the file
+            start = rng.randrange(len(content))
+            find_text = content[start : rng.randint(start + 1, len(content))]
+        else:
+            find_text = _random_text(rng, 3)
+        if rng.random() < 0.5:
+            # Same encoded length, patched in place
+            replace_text = "".join(rng.choices("xyz\n ", k=len(find_text.encode())))
+        else:
+            replace_text = _random_text(rng, 4)
+        encoded = content.encode()
+        if rng.random() < 0.05:
+            encoded += b"\xff"
+        fast_path.write_bytes(encoded)
+        slow_path.write_bytes(encoded)
+
+        replaced = utils.replace_unique_in_file(fast_path, find_text, replace_text)
+        try:
+            replace_in_file(slow_path, find_text, replace_text, require_line_num=False)
+        except (ValueError, UnicodeDecodeError):
+            assert not replaced, (content, find_text, replace_text)
+            assert fast_path.read_bytes() == encoded
+            continue
+
+        if replaced:
+            assert fast_path.read_bytes() == slow_path.read_bytes(), (
+                content,
+                find_text,
+                replace_text,
+            )
+            if len(replace_text.encode()) == len(find_text.encode()):
+                num_in_place += 1
+            else:
+                num_rewritten += 1
+        else:
+            assert fast_path.read_bytes() == encoded
+    assert num_in_place > 100
+    assert num_rewritten > 100
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+from typing import Any
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from confucius.core import types as cf
+from confucius.core.chat_models.bedrock.api.invoke_model import anthropic as ant
+from confucius.core.memory import CfMemory, CfMessage
+from confucius.orchestrator.extensions.plan.llm import LLMPlannerExtension
+
+WILL_BE_OMITTED = "will_be_omitted"
+
+
+@pytest.fixture(autouse=True)
+def _chars_per_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    # The estimate is otherwise read from the session storage of the current context
+    monkeypatch.setattr(
+        LLMPlannerExtension, "get_num_chars_per_token_estimate", lambda self: 3.0
+    )
+
+
+def _planner(triggered: bool = True, **kwargs: Any) -> LLMPlannerExtension:
+    if triggered:
+        # Triggered by the number of messages, without summarizing any message
+        # since the whole prompt fits in min_prompt_length
+        kwargs = {
+            "max_num_messages": 0,
+            "max_prompt_length": 10**9,
+            "min_prompt_length": 10**9,
+            **kwargs,
+        }
+    return LLMPlannerExtension(
+        prompt=ChatPromptTemplate.from_messages([("human", "plan")]), **kwargs
+    )
+
+
+def _call(
+    tool_use_id: str,
+    name: str,
+    tool_input: dict[str, Any],
+    output: str,
+    is_error: bool = False,
+) -> list[CfMessage]:
+    tool_use = ant.MessageContentToolUse(id=tool_use_id, name=name, input=tool_input)
+    tool_result = ant.MessageContentToolResult(
+        tool_use_id=tool_use_id, content=output, is_error=is_error
+    )
+    return [
+        CfMessage(type=cf.MessageType.AI, content=[tool_use.dict()]),
+        CfMessage(type=cf.MessageType.HUMAN, content=[tool_result.dict()]),
+    ]
+
+
+def _task() -> list[CfMessage]:
+    return [CfMessage(type=cf.MessageType.HUMAN, content="task")]
+
+
+async def _statuses(
+    planner: LLMPlannerExtension, messages: list[CfMessage]
+) -> list[str | None]:
+    memory = await planner.on_memory(CfMemory(messages=messages), None)
+    assert memory.messages == messages
+    return [msg.additional_kwargs.get("filter_status") for msg in messages]
+
+
+@pytest.mark.asyncio
+async def test_repeated_call_omitted_in_pairs() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", "read", {"path": "a", "n": 1}, "A"),
+        *_call("t2", "read", {"path": "b"}, "B"),
+        *_call("t3", "read", {"n": 1, "path": "a"}, "A"),
+    ]
+    planner = _planner()
+    assert await _statuses(planner, messages) == [
+        None,
+        WILL_BE_OMITTED,
+        WILL_BE_OMITTED,
+        None,
+        None,
+        None,
+        None,
+    ]
+    assert planner._messages_to_be_omitted == messages[1:3]
+
+
+@pytest.mark.asyncio
+async def test_repeated_call_untouched_below_threshold() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", "read", {"path": "a"}, "A"),
+        *_call("t2", "read", {"path": "a"}, "A"),
+    ]
+    planner = _planner(triggered=False)
+    assert await _statuses(planner, messages) == [None] * 5
+    assert not planner._messages_to_be_omitted
+
+
+@pytest.mark.asyncio
+async def test_different_result_or_error_kept() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", "read", {"path": "a"}, "A"),
+        *_call("t2", "read", {"path": "a"}, "A", is_error=True),
+        *_call("t3", "read", {"path": "a"}, "changed"),
+    ]
+    assert await _statuses(_planner(), messages) == [None] * 7
+
+
+@pytest.mark.asyncio
+async def test_tool_use_with_several_results_skipped() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", "read", {"path": "a"}, "A"),
+        _call("t1", "read", {"path": "a"}, "A")[1],
+        *_call("t2", "read", {"path": "a"}, "A"),
+    ]
+    assert await _statuses(_planner(), messages) == [None] * 6
+
+
+@pytest.mark.asyncio
+async def test_nothing_omitted_before_start_index() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", "read", {"path": "a"}, "A"),
+        *_call("t2", "read", {"path": "b"}, "B"),
+        *_call("t3", "read", {"path": "a"}, "A"),
+        *_call("t4", "read", {"path": "b"}, "B"),
+    ]
+    assert await _statuses(_planner(start_index=3), messages) == [
+        None,
+        None,
+        None,
+        WILL_BE_OMITTED,
+        WILL_BE_OMITTED,
+        None,
+        None,
+        None,
+        None,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_repeated_call_in_tail_keep_kept() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", "read", {"path": "a"}, "A"),
+        *_call("t2", "read", {"path": "a"}, "A"),
+    ]
+    assert await _statuses(_planner(tail_keep=4), messages) == [None] * 5
+
+
+EDITOR = "str_replace_based_edit_tool"
+
+
+@pytest.mark.asyncio
+async def test_edits_superseded_by_full_view_of_normalized_path() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", EDITOR, {"command": "create", "path": "/x/f.py"}, "ok"),
+        *_call("t2", EDITOR, {"command": "str_replace", "path": "/x/./f.py"}, "ok"),
+        *_call("t3", EDITOR, {"command": "view", "path": "/x/f.py"}, "content"),
+    ]
+    planner = _planner()
+    assert await _statuses(planner, messages) == [
+        None,
+        *[WILL_BE_OMITTED] * 4,
+        None,
+        None,
+    ]
+    assert planner._messages_to_be_omitted == messages[1:5]
+
+
+@pytest.mark.asyncio
+async def test_edits_untouched_below_threshold() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", EDITOR, {"command": "insert", "path": "/x/f.py"}, "ok"),
+        *_call("t2", EDITOR, {"command": "view", "path": "/x/f.py"}, "content"),
+    ]
+    assert await _statuses(_planner(triggered=False), messages) == [None] * 5
+
+
+@pytest.mark.asyncio
+async def test_partial_and_failed_views_do_not_supersede() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", EDITOR, {"command": "insert", "path": "/x/f.py"}, "ok"),
+        *_call(
+            "t2",
+            EDITOR,
+            {"command": "view", "path": "/x/f.py", "view_range": [1, 5]},
+            "lines",
+        ),
+        *_call(
+            "t3", EDITOR, {"command": "view", "path": "/x/f.py"}, "no", is_error=True
+        ),
+    ]
+    assert await _statuses(_planner(), messages) == [None] * 7
+
+
+@pytest.mark.asyncio
+async def test_edits_after_last_view_kept() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", EDITOR, {"command": "undo_edit", "path": "/x/f.py"}, "ok"),
+        *_call("t2", EDITOR, {"command": "view", "path": "/x/f.py"}, "content"),
+        *_call("t3", EDITOR, {"command": "str_replace", "path": "/x/f.py"}, "ok"),
+        *_call("t4", EDITOR, {"command": "view", "path": "/x/g.py"}, "other"),
+    ]
+    assert await _statuses(_planner(), messages) == [
+        None,
+        WILL_BE_OMITTED,
+        WILL_BE_OMITTED,
+        *[None] * 6,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_non_editor_tools_ignored() -> None:
+    messages = [
+        *_task(),
+        *_call("t1", "write_file", {"command": "create", "path": "/x/f.py"}, "ok"),
+        *_call("t2", EDITOR, {"command": "view", "path": "/x/f.py"}, "content"),
+    ]
+    assert await _statuses(_planner(), messages) == [None] * 5